@@ -9,6 +9,7 @@ from random import randint, shuffle
 from time import sleep
 from typing import Final
 import contextlib
+from concurrent.futures import Future
 
 import requests
 from selenium.webdriver.common.by import By
@@ -19,10 +20,12 @@ from trendspy import Trends
 
 from src.browser import Browser
 from src.utils import CONFIG, getProjectRoot, cooldown, COUNTRY, makeRequestsSession
+from src.warmup import submitWarmUp
 
 LOAD_DATE_KEY = "loadDate"
 GLOBAL_KEYWORDS_DB = "used_keywords"
 GLOBAL_LOAD_DATE_KEY = "globalLoadDate"  # NEW in v2.4
+DAILY_TRENDS_PREFETCH = 25  # Trends fetched by the warm-up, the dashboard is not read for the count
 
 class RetriesStrategy(Enum):
     """Identical to original docstrings"""
@@ -44,38 +47,67 @@ class Searches:
         self.searchRelatedTerms = searchRelatedTerms
         self.relatedTermsCount = relatedTermsCount
         self.num_additional_searches = num_additional_searches
-
-        dumbDbm = dbm.dumb.open((getProjectRoot() / "google_trends").__str__())
-        self.googleTrendsShelf: shelve.Shelf = shelve.Shelf(dumbDbm)
-        
-        globalDbm = dbm.dumb.open((getProjectRoot() / GLOBAL_KEYWORDS_DB).__str__())
-        self.usedKeywordsShelf: shelve.Shelf = shelve.Shelf(globalDbm)
-        
-        global_load_date = self.usedKeywordsShelf.get(GLOBAL_LOAD_DATE_KEY)
-        if global_load_date is None or global_load_date < date.today():
-            self.usedKeywordsShelf.clear()
-            self.usedKeywordsShelf[GLOBAL_LOAD_DATE_KEY] = date.today()
-
-        loadDate: date | None = None
-        if LOAD_DATE_KEY in self.googleTrendsShelf:
-            loadDate = self.googleTrendsShelf[LOAD_DATE_KEY]
-
-        if loadDate is None or loadDate < date.today():
-            self.googleTrendsShelf.clear()
-            self.googleTrendsShelf[LOAD_DATE_KEY] = date.today()
-            trends = self.getGoogleTrends(
-                self.browser.getRemainingSearches(desktopAndMobile=True).getTotal()
-            )
-            shuffle(trends)
-            for trend in trends:
-                if trend.lower() not in self.usedKeywordsShelf:
-                    self.googleTrendsShelf[trend] = None
-            logging.debug(f"TRENDS LOADED: {list(self.googleTrendsShelf.keys())}")
-
-        # Automatically trigger searches when an instance is created
-        logging.info("Automatically starting Bing searches inside Searches class")
-        self.bingSearches(searchRelatedTerms=self.searchRelatedTerms, relatedTermsCount=self.relatedTermsCount)
-        logging.info("Search execution completed!")
+        # NEW: Construction is side-effect free, the stores and trends are prepared by warmUp()
+        self.googleTrendsShelf: shelve.Shelf | None = None
+        self.usedKeywordsShelf: shelve.Shelf | None = None
+        self.warm = False
+        self.warmUpFuture: Future | None = None
+
+    def warmUp(self, background: bool = True) -> None:
+        """
+        Open the stores, apply the daily reset and fetch today's trends in the background.
+        The shelves are only used from the calling thread, in finishWarmUp().
+        """
+        if self.usedKeywordsShelf is None:
+            dumbDbm = dbm.dumb.open((getProjectRoot() / "google_trends").__str__())
+            self.googleTrendsShelf = shelve.Shelf(dumbDbm)
+
+            globalDbm = dbm.dumb.open((getProjectRoot() / GLOBAL_KEYWORDS_DB).__str__())
+            self.usedKeywordsShelf = shelve.Shelf(globalDbm)
+
+            global_load_date = self.usedKeywordsShelf.get(GLOBAL_LOAD_DATE_KEY)
+            if global_load_date is None or global_load_date < date.today():
+                self.usedKeywordsShelf.clear()
+                self.usedKeywordsShelf[GLOBAL_LOAD_DATE_KEY] = date.today()
+
+        if self.warmUpFuture is None and not self.warm:
+            loadDate: date | None = self.googleTrendsShelf.get(LOAD_DATE_KEY)
+            if loadDate is None or loadDate < date.today():
+                self.googleTrendsShelf.clear()
+                self.googleTrendsShelf[LOAD_DATE_KEY] = date.today()
+                self.warmUpFuture = submitWarmUp(self.getGoogleTrends, DAILY_TRENDS_PREFETCH)
+            else:
+                self.warm = True
+        if not background:
+            self.finishWarmUp()
+
+    def finishWarmUp(self) -> None:
+        """Store the trends fetched by the warm-up, starting it first if warmUp() was never called"""
+        if self.warmUpFuture is None:
+            if self.warm:
+                return
+            self.warmUp()
+            if self.warmUpFuture is None:
+                return
+        trends = self.warmUpFuture.result()
+        self.warmUpFuture = None
+        shuffle(trends)
+        for trend in trends:
+            if trend.lower() not in self.usedKeywordsShelf:
+                self.googleTrendsShelf[trend] = None
+        logging.debug(f"TRENDS LOADED: {list(self.googleTrendsShelf.keys())}")
+        self.warm = True
+
+    def __enter__(self):
+        self.warmUp(background=True)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.warmUpFuture is not None:
+            self.warmUpFuture.cancel()
+        if self.usedKeywordsShelf is not None:
+            self.googleTrendsShelf.close()
+            self.usedKeywordsShelf.close()
 
     def getGoogleTrends(self, wordsCount: int) -> list[str]:
         """Fetch trends using trendspy"""
@@ -120,6 +152,7 @@ class Searches:
 
 def bingSearches(self, searchRelatedTerms: bool = False, relatedTermsCount: int = 2) -> None:
     logging.info(f"[BING] Starting {self.browser.browserType.capitalize()} Edge Bing searches...")
+    self.finishWarmUp()
     self.browser.utils.goToSearch()
 
     remainingSearches = self.browser.getRemainingSearches()
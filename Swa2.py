@@ -6,6 +6,9 @@ def bingSearches(self) -> None:
     remaining = self.browser.getRemainingSearches(desktopAndMobile=True)
     total_needed = remaining.desktop if self.browser.browserType == "desktop" else remaining.mobile
     searchCount = 0
+    # NEW: Stop once the account's counter no longer moves with the searches
+    saturation = SaturationDetector()
+    saturation.record(searchCount, total_needed)
 
     while searchCount < total_needed:
 
@@ -36,6 +39,12 @@ def bingSearches(self) -> None:
 
         # Modified bingSearch() call - now returns search count
         searchCount += self.bingSearch(max_searches=searches_per_cycle)
+        saturation.record(searchCount, self.browser.getRemainingSearches())
+        if saturation.credited:
+            break
+        if saturation.saturated():
+            logging.warning(f"[BING] Ending early: {saturation.reason}")
+            break
         sleep(randint(10, 15))  # Original random delay
 
     logging.info(f"[BING] Finished {self.browser.browserType.capitalize()} Edge Bing searches!")
@@ -5,6 +5,9 @@ def bingSearches(self, searchRelatedTerms: bool = False, relatedTermsCount: int
 
         remainingSearches = self.browser.getRemainingSearches()
         searchCount = 0
+        # NEW: Stop once the account's counter no longer moves with the searches
+        saturation = SaturationDetector()
+        saturation.record(searchCount, remainingSearches)
     
         while searchCount < remainingSearches:
             logging.info(f"[BING] {searchCount + 1}/{remainingSearches}")
@@ -32,6 +35,12 @@ def bingSearches(self, searchRelatedTerms: bool = False, relatedTermsCount: int
             searchCount = self.bingSearch(searchCount)  
             if searchCount >= remainingSearches:
                 break
+            saturation.record(searchCount, self.browser.getRemainingSearches())
+            if saturation.credited:
+                break
+            if saturation.saturated():
+                logging.warning(f"[BING] Ending early: {saturation.reason}")
+                break
 
             sleep(randint(10, 15))  # Original random delay
 
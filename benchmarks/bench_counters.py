@@ -0,0 +1,90 @@
+"""
+Compare the remaining-searches and points lookups through the rendered rewards dashboard with the
+JSON counters API, against the local stub site in headless Chromium. Reports call counts and latency.
+Run from the project root: python -m benchmarks.bench_counters --lookups 20 --render-delay 0.5
+"""
+import argparse
+from time import monotonic
+
+from benchmarks.driver import headlessChrome
+from benchmarks.stubsite import StubSite, StubSiteSettings
+from src.counters import RemainingSearches, RewardsCounters, remainingFromStatus
+from src.metrics import RUN_METRICS, percentile
+
+
+class DashboardUtils:
+    def __init__(self, browser: "DashboardBrowser"):
+        self.browser = browser
+
+    def getDashboardData(self) -> dict:
+        self.browser.webdriver.get(f"{self.browser.site.url}rewards")
+        return self.browser.webdriver.execute_script("return dashboard")
+
+    def getAccountPoints(self) -> int:
+        return self.getDashboardData()["userStatus"]["availablePoints"]
+
+
+class DashboardBrowser:
+    """The part of src.browser.Browser that reads the counters by rendering the dashboard"""
+
+    def __init__(self, site: StubSite, browserType: str = "desktop"):
+        self.site = site
+        self.browserType = browserType
+        self.webdriver = headlessChrome()
+        self.userAgent = self.webdriver.execute_script("return navigator.userAgent")
+        self.utils = DashboardUtils(self)
+
+    def getRemainingSearches(self, desktopAndMobile: bool = False) -> RemainingSearches | int:
+        remaining = remainingFromStatus(self.utils.getDashboardData()["userStatus"])
+        if desktopAndMobile:
+            return remaining
+        return remaining.mobile if self.browserType == "mobile" else remaining.desktop
+
+
+def measure(name: str, lookup, lookups: int, site: StubSite) -> None:
+    site.requests.clear()
+    durations = []
+    for _ in range(lookups):
+        start = monotonic()
+        lookup()
+        durations.append(monotonic() - start)
+    print(
+        f"{name:<10} lookups={lookups:<4} p50={percentile(durations, 0.5) * 1000:8.1f}ms "
+        f"p90={percentile(durations, 0.9) * 1000:8.1f}ms total={sum(durations):6.2f}s "
+        f"requests={dict(site.requests)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=20, help="Remaining searches lookups, each followed by a points lookup")
+    parser.add_argument("--render-delay", type=float, default=0.2)
+    parser.add_argument("--image-count", type=int, default=20)
+    parser.add_argument("--ttl", type=float, default=5.0, help="Cache duration of the JSON counters")
+    arguments = parser.parse_args()
+
+    settings = StubSiteSettings(renderDelay=arguments.render_delay, imageCount=arguments.image_count)
+    with StubSite(settings) as site:
+        browser = DashboardBrowser(site)
+        try:
+            # Cookies are read from the browser, so it must have visited the site
+            browser.webdriver.get(site.url)
+            counters = RewardsCounters(browser, ttl=arguments.ttl, url=f"{site.url}api/getuserinfo")
+
+            def scraped() -> None:
+                browser.getRemainingSearches(desktopAndMobile=True)
+                browser.utils.getAccountPoints()
+
+            def json() -> None:
+                counters.getRemainingSearches(desktopAndMobile=True)
+                counters.getAccountPoints()
+
+            measure("dashboard", scraped, arguments.lookups, site)
+            measure("json", json, arguments.lookups, site)
+        finally:
+            browser.webdriver.quit()
+    print(f"counters: {dict((k, v) for k, v in RUN_METRICS.counters.items() if k.startswith('counters.'))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Drive the real Searches.bingSearch() code path against the local stub site in headless Chromium.
+Reports per-step latencies and pages per minute, cooldowns excluded.
+Run from the project root: python -m benchmarks.bench_e2e --steps 5 --render-delay 0.2
+"""
+import argparse
+import tempfile
+from pathlib import Path
+from time import monotonic
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+import src.searches
+import src.stores
+from benchmarks.driver import headlessChrome
+from benchmarks.stubsite import StubSite, StubSiteSettings
+from src.metrics import RUN_METRICS
+from src.searches import Searches
+from src.searchplan import SearchStep
+
+PHASE = "benchmark"
+
+
+class ResultsTimingElement:
+    """Search box whose submit() also waits for the stub results page, to time the navigation"""
+
+    def __init__(self, element: WebElement, webdriver):
+        self.element = element
+        self.webdriver = webdriver
+
+    def __getattr__(self, name):
+        return getattr(self.element, name)
+
+    def submit(self) -> None:
+        start = monotonic()
+        self.element.submit()
+        WebDriverWait(self.webdriver, 60).until(
+            expected_conditions.presence_of_element_located((By.ID, "b_results"))
+        )
+        RUN_METRICS.observe("step.results.seconds", monotonic() - start)
+
+
+class StubBrowserUtils:
+    def __init__(self, browser: "StubBrowser"):
+        self.browser = browser
+
+    def goToSearch(self) -> None:
+        self.browser.webdriver.get(self.browser.site.url)
+
+    def waitUntilClickable(self, by: str, selector: str, timeToWait: float = 10) -> ResultsTimingElement:
+        element = WebDriverWait(self.browser.webdriver, timeToWait).until(
+            expected_conditions.element_to_be_clickable((by, selector))
+        )
+        return ResultsTimingElement(element, self.browser.webdriver)
+
+
+class StubBrowser:
+    """The part of src.browser.Browser that Searches.bingSearch() uses"""
+
+    def __init__(self, site: StubSite, browserType: str = "desktop"):
+        self.site = site
+        self.browserType = browserType
+        self.localeGeo = "US"
+        self.webdriver = headlessChrome()
+        self.userAgent = self.webdriver.execute_script("return navigator.userAgent")
+        self.utils = StubBrowserUtils(self)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=5, help="Search cycles, each with its related searches")
+    parser.add_argument("--related", type=int, default=2, help="Related searches per cycle")
+    parser.add_argument("--render-delay", type=float, default=0.0)
+    parser.add_argument("--asset-delay", type=float, default=0.0)
+    parser.add_argument("--image-count", type=int, default=20)
+    parser.add_argument("--image-bytes", type=int, default=50_000)
+    parser.add_argument("--lightweight", action="store_true", help="Enable the lightweight page-load mode")
+    parser.add_argument("--skip-typing-pauses", action="store_true", help="Skip the 1s pauses around typing")
+    arguments = parser.parse_args()
+
+    # Cooldowns are excluded and the keyword stores go to a scratch folder
+    src.searches.cooldown = lambda: None
+    if arguments.skip_typing_pauses:
+        src.searches.sleep = lambda seconds: None
+    scratch = Path(tempfile.mkdtemp(prefix="bench-e2e-"))
+    src.stores.getProjectRoot = lambda: scratch
+
+    settings = StubSiteSettings(
+        renderDelay=arguments.render_delay,
+        assetDelay=arguments.asset_delay,
+        imageCount=arguments.image_count,
+        imageBytes=arguments.image_bytes,
+    )
+    with StubSite(settings) as site:
+        browser = StubBrowser(site)
+        try:
+            # Benchmark runs are not recorded, they would skew the regressions of the real runs
+            searches = Searches(browser, num_additional_searches=arguments.related, record_history=False)
+            assert searches.usedKeywordsPath.is_relative_to(scratch), f"Stores outside {scratch}"
+            # No trends are needed, the steps are synthetic
+            searches.warm = True
+            searches.lightweight = arguments.lightweight and src.searches.enableLightweightMode(browser.webdriver)
+            if searches.lightweight:
+                src.searches.BING_URL = site.url
+            with searches, RUN_METRICS.phase(PHASE):
+                start = monotonic()
+                for i in range(arguments.steps):
+                    relatedTerms = [f"stub keyword {i} related {j}" for j in range(arguments.related)]
+                    searches.bingSearch(SearchStep(f"stub keyword {i}", relatedTerms, browser.browserType))
+                elapsed = monotonic() - start
+        finally:
+            browser.webdriver.quit()
+
+    pages = RUN_METRICS.counters["searches.submitted"]
+    print(f"{pages} searches in {elapsed:.1f}s: {60 * pages / elapsed:.1f} pages/minute")
+    for name, stats in sorted(RUN_METRICS.phaseSummary(PHASE).items()):
+        print(
+            f"{name:<32} n={stats['count']:<4} p50={stats['p50'] * 1000:8.1f}ms "
+            f"p90={stats['p90'] * 1000:8.1f}ms max={stats['peak'] * 1000:8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare browser startup time and memory of the Xvfb path used by the launchers (virtual display
+plus a windowed Chromium) with the headless mode, loading the local stub search page.
+Run from the project root: python -m benchmarks.bench_headless --launches 3
+"""
+import argparse
+import shutil
+import subprocess
+from pathlib import Path
+from time import monotonic, sleep
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+from benchmarks.driver import headlessChrome, windowedChrome
+from benchmarks.stubsite import StubSite
+from src.headless import WINDOW_SIZE
+from src.metrics import percentile
+from src.resources import descendants, readRssBytes
+
+DISPLAY_NUMBER = 99
+
+
+def startXvfb() -> subprocess.Popen:
+    """Start Xvfb like the launchers and wait for its socket rather than a fixed sleep"""
+    width, height = WINDOW_SIZE
+    process = subprocess.Popen(
+        ["Xvfb", f":{DISPLAY_NUMBER}", "-screen", "0", f"{width}x{height}x16", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    socket = Path(f"/tmp/.X11-unix/X{DISPLAY_NUMBER}")
+    deadline = monotonic() + 10
+    while not socket.exists():
+        if monotonic() > deadline or process.poll() is not None:
+            raise RuntimeError("Xvfb did not start")
+        sleep(0.05)
+    return process
+
+
+def rssBytes(pids: list[int]) -> int:
+    total = 0
+    for pid in pids:
+        try:
+            total += readRssBytes(pid)
+        except OSError:
+            continue
+    return total
+
+
+def launch(mode: str, url: str) -> tuple[float, int]:
+    """Seconds until the search box of url is usable, and RSS of everything the mode started"""
+    start = monotonic()
+    xvfb = startXvfb() if mode == "xvfb" else None
+    driver = windowedChrome(f":{DISPLAY_NUMBER}") if xvfb else headlessChrome()
+    try:
+        driver.get(url)
+        WebDriverWait(driver, 30).until(expected_conditions.element_to_be_clickable((By.ID, "sb_form_q")))
+        elapsed = monotonic() - start
+        root = driver.service.process.pid
+        pids = [root, *descendants(root)] + ([xvfb.pid] if xvfb else [])
+        return elapsed, rssBytes(pids)
+    finally:
+        driver.quit()
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--launches", type=int, default=3, help="Launches per mode")
+    arguments = parser.parse_args()
+
+    modes = ["headless"] + (["xvfb"] if shutil.which("Xvfb") else [])
+    if "xvfb" not in modes:
+        print("Xvfb is not installed, only the headless mode is measured")
+    with StubSite() as site:
+        for mode in modes:
+            results = [launch(mode, site.url) for _ in range(arguments.launches)]
+            durations = [seconds for seconds, _ in results]
+            memory = [rss / 1024 / 1024 for _, rss in results]
+            print(
+                f"{mode:<9} launches={len(results)} startup p50={percentile(durations, 0.5):6.2f}s "
+                f"max={max(durations):6.2f}s rss p50={percentile(memory, 0.5):7.1f}MB max={max(memory):7.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
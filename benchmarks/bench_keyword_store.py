@@ -0,0 +1,153 @@
+"""
+Micro-benchmarks of the googleTrendsShelf / usedKeywordsShelf access patterns of Searches,
+at growing store sizes. Each size runs in its own process so its peak RSS is meaningful.
+
+Run from the project root:
+    python -m benchmarks.bench_keyword_store                      # report
+    python -m benchmarks.bench_keyword_store --save-baseline b.json
+    python -m benchmarks.bench_keyword_store --baseline b.json    # exit 1 on regressions
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+
+from src.stores import openStore, recreateStore
+
+LOAD_DATE_KEY = "loadDate"
+SIZES = [10, 1_000, 10_000, 100_000]
+BUDGET = 2.0  # Seconds per operation, slow operations report the rate reached within it
+
+
+def diskSize(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.parent.glob(f"{path.name}.*"))
+
+
+def rate(operation, count: int) -> float:
+    """Operations per second of operation(i) for i in range(count), within BUDGET seconds"""
+    start = perf_counter()
+    done = 0
+    for i in range(count):
+        operation(i)
+        done += 1
+        if perf_counter() - start > BUDGET:
+            break
+    return done / (perf_counter() - start)
+
+
+def measure(size: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-store-") as folder:
+        return measureIn(Path(folder), size)
+
+
+def measureIn(folder: Path, size: int) -> dict:
+    trendsPath, usedPath = folder / "google_trends", folder / "used_keywords"
+    results: dict[str, float] = {}
+
+    # Fill both stores: a trend pool of `size` keywords, half of which have been used
+    trends, used = openStore(trendsPath), openStore(usedPath)
+    trends[LOAD_DATE_KEY] = date.today()
+    results["insert"] = rate(lambda i: trends.__setitem__(f"trend keyword {i}", None), size)
+    for i in range(len(trends) - 1, size):
+        trends[f"trend keyword {i}"] = None
+    for i in range(0, size, 2):
+        used[f"trend keyword {i}"] = None
+    trends.close()
+    used.close()
+
+    start = perf_counter()
+    trends, used = openStore(trendsPath), openStore(usedPath)
+    results["open"] = 1 / (perf_counter() - start)
+
+    # bingSearches(): the available trends scan
+    results["keys scan"] = rate(
+        lambda i: [k for k in trends.keys() if k != LOAD_DATE_KEY and k.lower() not in used], 1_000
+    )
+    # __init__ / refreshTrendsPool(): membership checks against the used keywords
+    results["in check"] = rate(lambda i: f"trend keyword {i % size}" in used, 100_000)
+    # A sync after each write, as a keyword marked used is flushed to disk
+    results["write sync"] = rate(lambda i: (used.__setitem__(f"synced keyword {i}", None), used.sync()), 100)
+    results["disk bytes"] = diskSize(trendsPath) + diskSize(usedPath)
+
+    # Daily reset: the used keywords store is recreated empty, as dailyReset() does
+    start = perf_counter()
+    used = recreateStore(used, usedPath)
+    results["reset seconds"] = perf_counter() - start
+    # bingSearch(): a keyword is marked used then deleted from the pool
+    results["mark used"] = rate(lambda i: used.__setitem__(f"new keyword {i}", None), min(size, 10_000))
+    results["delete"] = rate(lambda i: trends.__delitem__(f"trend keyword {i}"), min(size, 10_000))
+    trends.close()
+    used.close()
+
+    results["peak rss bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return results
+
+
+def lowerIsBetter(name: str) -> bool:
+    """Rates must not drop, sizes and durations must not grow"""
+    return name.endswith(("bytes", "seconds"))
+
+
+def runAll(sizes: list[int]) -> dict[str, dict]:
+    report = {}
+    for size in sizes:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_keyword_store", "--worker", str(size)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        report[str(size)] = json.loads(output)
+    return report
+
+
+def printReport(report: dict[str, dict]) -> None:
+    for size, results in report.items():
+        print(f"== {size} keys")
+        for name, value in results.items():
+            unit = "" if lowerIsBetter(name) else " ops/s"
+            print(f"  {name:<16} {value:>16,.1f}{unit}")
+
+
+def regressions(report: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    found = []
+    for size, results in report.items():
+        for name, value in results.items():
+            reference = baseline.get(size, {}).get(name)
+            if not reference:
+                continue
+            change = (value - reference if lowerIsBetter(name) else reference - value) / reference
+            if change > threshold:
+                found.append(f"{size} keys, {name}: {reference:,.1f} -> {value:,.1f} ({change:+.0%})")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--baseline", type=Path, help="Fail when a result regresses beyond the threshold")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Tolerated regression, 0.3 is 30%%")
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.worker:
+        print(json.dumps(measure(arguments.worker)))
+        return
+
+    report = runAll(arguments.sizes)
+    printReport(report)
+    if arguments.save_baseline:
+        arguments.save_baseline.write_text(json.dumps(report, indent=2))
+    if arguments.baseline:
+        found = regressions(report, json.loads(arguments.baseline.read_text()), arguments.threshold)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare full page loads with the lightweight mode on the local stub site.
+Run from the project root: python -m benchmarks.bench_lightweight --searches 20
+"""
+import argparse
+import statistics
+from time import monotonic
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+from benchmarks.driver import headlessChrome
+from benchmarks.stubsite import StubSite, StubSiteSettings
+from src.lightweight import enableLightweightMode, navigateEager
+
+TRANSFER_SIZE_SCRIPT = """
+return performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'))
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+
+def runMode(site: StubSite, lightweight: bool, searches: int) -> dict:
+    driver = headlessChrome()
+    try:
+        if lightweight:
+            enableLightweightMode(driver)
+        driver.get(site.url)
+        bytesBefore = site.bytesSent
+        toSearchbar, perSearch, transferred = [], [], 0
+        for i in range(searches):
+            start = monotonic()
+            if lightweight:
+                navigateEager(driver, site.url)
+            else:
+                driver.get(site.url)
+            searchbar = WebDriverWait(driver, 60).until(
+                expected_conditions.element_to_be_clickable((By.ID, "sb_form_q"))
+            )
+            toSearchbar.append(monotonic() - start)
+            transferred += driver.execute_script(TRANSFER_SIZE_SCRIPT)
+            searchbar.clear()
+            searchbar.send_keys(f"stub query {i}")
+            searchbar.submit()
+            WebDriverWait(driver, 60).until(
+                expected_conditions.presence_of_element_located((By.ID, "b_results"))
+            )
+            perSearch.append(monotonic() - start)
+            transferred += driver.execute_script(TRANSFER_SIZE_SCRIPT)
+        return {
+            "searchbar p50": statistics.median(toSearchbar),
+            "search p50": statistics.median(perSearch),
+            "bytes/search (browser)": transferred / searches,
+            "bytes/search (server)": (site.bytesSent - bytesBefore) / searches,
+        }
+    finally:
+        driver.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--searches", type=int, default=10)
+    parser.add_argument("--image-count", type=int, default=20)
+    parser.add_argument("--image-bytes", type=int, default=50_000)
+    parser.add_argument("--asset-delay", type=float, default=0.05)
+    parser.add_argument("--render-delay", type=float, default=0.0)
+    arguments = parser.parse_args()
+
+    settings = StubSiteSettings(
+        renderDelay=arguments.render_delay,
+        assetDelay=arguments.asset_delay,
+        imageCount=arguments.image_count,
+        imageBytes=arguments.image_bytes,
+    )
+    with StubSite(settings) as site:
+        results = {
+            "full": runMode(site, False, arguments.searches),
+            "lightweight": runMode(site, True, arguments.searches),
+        }
+    for mode, result in results.items():
+        print(
+            f"{mode:<12} searchbar p50={result['searchbar p50'] * 1000:7.1f}ms "
+            f"search p50={result['search p50'] * 1000:7.1f}ms "
+            f"browser bytes/search={result['bytes/search (browser)']:10.0f} "
+            f"server bytes/search={result['bytes/search (server)']:10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
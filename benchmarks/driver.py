@@ -0,0 +1,28 @@
+"""Chromium drivers shared by the browser benchmarks"""
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from src.headless import WINDOW_SIZE, headlessArguments
+
+
+def _options(extraArguments: list[str] | None) -> Options:
+    options = Options()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    for argument in extraArguments or []:
+        options.add_argument(argument)
+    return options
+
+
+def headlessChrome(extraArguments: list[str] | None = None) -> webdriver.Chrome:
+    return webdriver.Chrome(options=_options([*headlessArguments(), *(extraArguments or [])]))
+
+
+def windowedChrome(display: str, extraArguments: list[str] | None = None) -> webdriver.Chrome:
+    """Windowed Chromium on an X display, like the launchers' Xvfb setup"""
+    width, height = WINDOW_SIZE
+    options = _options([f"--window-size={width},{height}", *(extraArguments or [])])
+    return webdriver.Chrome(options=options, service=Service(env={**os.environ, "DISPLAY": display}))
@@ -0,0 +1,142 @@
+"""
+Local stand-in for the Bing search and results pages, with the same element IDs, for the
+rewards dashboard and its user info JSON, and for a notification webhook (apprise json://).
+Render delay and page weight are configurable so browser-side changes can be measured offline.
+"""
+import json
+import threading
+import time
+from dataclasses import dataclass
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Smallest valid PNG header, padded to the requested image size
+PNG_HEADER = bytes.fromhex("89504e470d0a1a0a")
+
+
+@dataclass
+class StubSiteSettings:
+    renderDelay: float = 0.0  # Seconds before the HTML of a page is sent
+    assetDelay: float = 0.0  # Seconds before each image is sent
+    imageCount: int = 20  # Images per page
+    imageBytes: int = 50_000  # Size of each image
+    desktopTarget: int = 90  # Daily points of the desktop searches counter, 3 points per search
+    mobileTarget: int = 60  # Daily points of the mobile searches counter
+    webhookDelay: float = 0.0  # Seconds before a notification posted to /notify is answered
+    authCookie: str = ""  # 'name=value' cookie the user info JSON requires, none when empty
+
+
+class StubSite:
+    def __init__(self, settings: StubSiteSettings | None = None):
+        self.settings = settings or StubSiteSettings()
+        self.requests: dict[str, int] = {}
+        self.bytesSent = 0
+        self.notifications: list[dict] = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handlerClass())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self) -> "StubSite":
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def record(self, kind: str, size: int) -> None:
+        with self.lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            self.bytesSent += size
+
+    def userStatus(self) -> dict:
+        """Dashboard counters, each results page served counts as a desktop search"""
+        with self.lock:
+            searched = 3 * self.requests.get("results", 0)
+        return {
+            "availablePoints": 1000 + searched,
+            "levelInfo": {"activeLevel": "Level2"},
+            "counters": {
+                "pcSearch": [{"pointProgress": min(searched, self.settings.desktopTarget),
+                              "pointProgressMax": self.settings.desktopTarget}],
+                "mobileSearch": [{"pointProgress": 0, "pointProgressMax": self.settings.mobileTarget}],
+            },
+        }
+
+    def page(self, title: str, body: str) -> bytes:
+        images = "".join(
+            f'<img src="/img/{i}.png?t={time.monotonic_ns()}" width="10" height="10">'
+            for i in range(self.settings.imageCount)
+        )
+        return (
+            f"<!DOCTYPE html><html><head><title>{escape(title)}</title></head><body>"
+            '<form id="sb_form" action="/search" method="get">'
+            '<input id="sb_form_q" name="q" type="search" autocomplete="off">'
+            "</form>"
+            f"{body}<div id=\"images\">{images}</div></body></html>"
+        ).encode()
+
+    def _handlerClass(self) -> type:
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def send(self, kind: str, contentType: str, payload: bytes) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", contentType)
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(payload)
+                site.record(kind, len(payload))
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                settings = site.settings
+                if url.path.startswith("/img/"):
+                    time.sleep(settings.assetDelay)
+                    payload = PNG_HEADER + bytes(max(0, settings.imageBytes - len(PNG_HEADER)))
+                    self.send("image", "image/png", payload)
+                elif url.path == "/search":
+                    time.sleep(settings.renderDelay)
+                    query = parse_qs(url.query).get("q", [""])[0]
+                    results = "".join(
+                        f'<li class="b_algo"><h2><a href="/?r={i}">{escape(query)} {i}</a></h2></li>'
+                        for i in range(10)
+                    )
+                    self.send("results", "text/html", site.page(query, f'<ol id="b_results">{results}</ol>'))
+                elif url.path == "/api/getuserinfo":
+                    if settings.authCookie and settings.authCookie not in (self.headers.get("Cookie") or ""):
+                        self.send_error(401)
+                        return
+                    payload = json.dumps({"dashboard": {"userStatus": site.userStatus()}}).encode()
+                    self.send("userinfo", "application/json", payload)
+                elif url.path == "/rewards":
+                    time.sleep(settings.renderDelay)
+                    script = f"<script>var dashboard = {json.dumps({'userStatus': site.userStatus()})};</script>"
+                    self.send("dashboard", "text/html", site.page("Rewards", script))
+                elif url.path == "/":
+                    time.sleep(settings.renderDelay)
+                    self.send("search", "text/html", site.page("Bing", ""))
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                if urlparse(self.path).path != "/notify":
+                    self.send_error(404)
+                    return
+                notification = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                time.sleep(site.settings.webhookDelay)
+                with site.lock:
+                    site.notifications.append(notification)
+                self.send("notify", "application/json", b"{}")
+
+        return Handler
@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import sys
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from random import Random
+from time import sleep
+from typing import Callable, TypeVar
+
+from src.utils import CONFIG, getProjectRoot
+
+T = TypeVar("T")
+
+CASSETTE_VERSION = 1
+CASSETTES_DIR = "cassettes"
+
+
+class InjectedError(ConnectionError):
+    """Failure injected by a replaying cassette"""
+
+
+class Cassette:
+    """
+    Recorded responses of the trends and autocomplete services, stored as versioned JSON.
+    In record mode live calls go through and their payloads are saved; in replay mode the
+    payloads are served back, with optional injected latency and errors. A key that was never
+    recorded is served a recorded payload of the same kind, chosen deterministically from the key.
+    """
+
+    def __init__(self, path: Path, mode: str, latency: float = 0.0, errorRate: float = 0.0, seed: int = 0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}'")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.errorRate = errorRate
+        self.random = Random(seed)
+        self.lock = threading.Lock()
+        self.interactions: dict[str, dict[str, object]] = {}
+        if path.exists():
+            self.load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"No cassette to replay at {path}")
+
+    def load(self) -> None:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(
+                f"Cassette {self.path} has version {data.get('version')}, expected {CASSETTE_VERSION}"
+            )
+        self.interactions = data["interactions"]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": CASSETTE_VERSION,
+            "recorded": datetime.now().isoformat(timespec="seconds"),
+            "interactions": self.interactions,
+        }
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(data, indent=1, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporary, self.path)
+
+    def play(self, kind: str, key: str, live: Callable[[], T], injectedError: type[Exception] = InjectedError) -> T:
+        if self.mode == "record":
+            payload = live()
+            with self.lock:
+                self.interactions.setdefault(kind, {})[key] = payload
+                self.save()
+            return payload
+
+        with self.lock:
+            recorded = self.interactions.get(kind) or {}
+            failing = self.random.random() < self.errorRate
+        if self.latency:
+            sleep(self.latency)
+        if failing:
+            raise injectedError(f"Injected {kind} failure for '{key}'")
+        if key in recorded:
+            return recorded[key]
+        if not recorded:
+            raise KeyError(f"No {kind} interaction recorded in {self.path}")
+        keys = sorted(recorded)
+        return recorded[keys[zlib.crc32(key.encode()) % len(keys)]]
+
+
+_cassette: Cassette | None = None
+_cassetteLoaded = False
+
+
+def getCassette() -> Cassette | None:
+    """Cassette configured in the 'cassettes' config section, None when it is off"""
+    global _cassette, _cassetteLoaded
+    if not _cassetteLoaded:
+        _cassetteLoaded = True
+        cassetteConfig = CONFIG.get("cassettes") or {}
+        # YAML reads a bare 'off' as False
+        mode = cassetteConfig.get("mode") or "off"
+        if mode != "off":
+            _cassette = Cassette(
+                getProjectRoot() / CASSETTES_DIR / cassetteConfig.get("name", "default.json"),
+                mode,
+                latency=cassetteConfig.get("latency", 0.0),
+                errorRate=cassetteConfig.get("error-rate", 0.0),
+                seed=cassetteConfig.get("seed", 0),
+            )
+            logging.info(f"[CASSETTE] {mode.capitalize()}ing trends and autocomplete traffic with {_cassette.path}")
+    return _cassette
+
+
+def playOrLive(kind: str, key: str, live: Callable[[], T], injectedError: type[Exception] = InjectedError) -> T:
+    cassette = getCassette()
+    if cassette is None:
+        return live()
+    return cassette.play(kind, key, live, injectedError)
+
+
+if __name__ == "__main__":
+    # Summarize a cassette: python -m src.cassettes cassettes/default.json
+    cassette = Cassette(Path(sys.argv[1]), "replay")
+    for kind, recorded in cassette.interactions.items():
+        print(f"{kind}: {len(recorded)} interactions")
+        for key in sorted(recorded)[:10]:
+            print(f"  {key!r}")
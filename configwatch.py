@@ -0,0 +1,230 @@
+import copy
+import logging
+from pathlib import Path
+from time import monotonic
+from typing import Callable
+
+import yaml
+
+from src.metrics import RUN_METRICS
+from src.utils import CONFIG, getProjectRoot
+
+CONFIG_FILE = "config.yaml"
+# Settings read again at each use, or re-applied by an applier: a change takes effect at the next
+# step (or the next phase for the ones read when a phase starts). Entries ending with "." are prefixes.
+LIVE_SETTINGS = (
+    "cooldown.", "retries.", "deadlines.", "watchdog.", "logging.level", "search.",
+    "apprise.notify.", "apprise.summary", "warm-up.",
+)
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_MISSING = object()
+
+
+def _isInt(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _isNumber(value) -> bool:
+    return _isInt(value) or isinstance(value, float)
+
+
+# Expected shape of the settings that can be changed live, checked before anything is applied
+SCHEMA: dict[str, tuple[str, Callable[[object], bool]]] = {
+    "cooldown.min": ("a non-negative integer", lambda v: _isInt(v) and v >= 0),
+    "cooldown.max": ("a non-negative integer", lambda v: _isInt(v) and v >= 0),
+    "retries.max": ("a non-negative integer", lambda v: _isInt(v) and v >= 0),
+    "retries.backoff-factor": ("a non-negative number", lambda v: _isNumber(v) and v >= 0),
+    "retries.strategy": ("CONSTANT or EXPONENTIAL", lambda v: v in ("CONSTANT", "EXPONENTIAL")),
+    "retries.circuit-breaker.failure-threshold": ("a positive integer", lambda v: _isInt(v) and v > 0),
+    "retries.circuit-breaker.cool-off": ("a non-negative number", lambda v: _isNumber(v) and v >= 0),
+    "deadlines.cycle": ("a positive number", lambda v: _isNumber(v) and v > 0),
+    "deadlines.plan": ("a positive number", lambda v: _isNumber(v) and v > 0),
+    "deadlines.request": ("a positive number", lambda v: _isNumber(v) and v > 0),
+    "deadlines.trends": ("a positive number", lambda v: _isNumber(v) and v > 0),
+    "watchdog.enabled": ("true or false", lambda v: isinstance(v, bool)),
+    "watchdog.stall": ("a positive number", lambda v: _isNumber(v) and v > 0),
+    "watchdog.restart": ("a positive number", lambda v: _isNumber(v) and v > 0),
+    "watchdog.max-recoveries": ("a non-negative integer", lambda v: _isInt(v) and v >= 0),
+    "logging.level": (", ".join(LOG_LEVELS), lambda v: v in LOG_LEVELS),
+    "search.type": ("both, desktop or mobile", lambda v: v in ("both", "desktop", "mobile")),
+    "search.saturation-window": ("a non-negative integer", lambda v: _isInt(v) and v >= 0),
+}
+
+_appliers: list[Callable[[], None]] = []
+
+
+def onConfigApplied(applier: Callable[[], None]) -> Callable[[], None]:
+    """Register applier to be called after live settings changed, for values cached from CONFIG"""
+    _appliers.append(applier)
+    return applier
+
+
+def flattenSettings(config: dict, prefix: str = "") -> dict[str, object]:
+    """Leaves of config by dotted path, e.g. 'retries.circuit-breaker.cool-off'; lists are leaves"""
+    settings = {}
+    for key, value in config.items():
+        if isinstance(value, dict) and value:
+            settings.update(flattenSettings(value, f"{prefix}{key}."))
+        else:
+            settings[f"{prefix}{key}"] = value
+    return settings
+
+
+def validateConfig(config) -> list[str]:
+    if not isinstance(config, dict):
+        return ["the file is not a mapping of sections"]
+    settings = flattenSettings(config)
+    errors = [
+        f"{path} must be {expected}, not {settings[path]!r}"
+        for path, (expected, isValid) in SCHEMA.items()
+        if path in settings and not isValid(settings[path])
+    ]
+    cooldownMin, cooldownMax = settings.get("cooldown.min"), settings.get("cooldown.max")
+    if _isInt(cooldownMin) and _isInt(cooldownMax) and cooldownMin > cooldownMax:
+        errors.append(f"cooldown.min ({cooldownMin}) is above cooldown.max ({cooldownMax})")
+    return errors
+
+
+def isLive(path: str) -> bool:
+    return any(path.startswith(live) if live.endswith(".") else path == live for live in LIVE_SETTINGS)
+
+
+def _setSetting(config: dict, path: str, value) -> None:
+    *sections, key = path.split(".")
+    for section in sections:
+        if not isinstance(config.get(section), dict):
+            config[section] = {}
+        config = config[section]
+    if value is _MISSING:
+        config.pop(key, None)
+    else:
+        config[key] = value
+
+
+@onConfigApplied
+def applyLoggingLevel() -> None:
+    """'logging.level' is the level of the terminal, the log files keep everything"""
+    level = (CONFIG.get("logging") or {}).get("level")
+    if not level:
+        return
+    for handler in logging.getLogger().handlers:
+        if not isinstance(handler, logging.FileHandler):
+            handler.setLevel(level)
+
+
+class ConfigWatcher:
+    """
+    Reload config.yaml when it changes, checked by the search loop at step boundaries.
+    A file that does not parse or validate is rejected as a whole. Otherwise the live settings that
+    changed are swapped into CONFIG section by section and the appliers run; when one of them fails
+    the previous sections are restored. A live setting removed from the file keeps its current value
+    and other changes are logged as needing a restart and left out. Changes are computed against the
+    previous file, so settings overridden from the command line stay overridden until the file changes them.
+    """
+
+    def __init__(self, path: Path | None = None, interval: float | None = None):
+        self.path = path or getProjectRoot() / CONFIG_FILE
+        self.interval = interval if interval is not None else (CONFIG.get("hot-reload") or {}).get("interval", 5)
+        self.checkedAt = monotonic()
+        self.mtime = self._mtime()
+        self.settings = flattenSettings(self._read() or {})
+
+    def _mtime(self) -> float | None:
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+
+    def _read(self):
+        try:
+            return yaml.safe_load(self.path.read_text(encoding="utf-8"))
+        except (OSError, yaml.YAMLError) as e:
+            logging.warning(f"[CONFIG] Cannot read {self.path}: {e}")
+            return None
+
+    def poll(self) -> bool:
+        """Reload the file when it changed since the last check, at most once per interval"""
+        if monotonic() - self.checkedAt < self.interval:
+            return False
+        self.checkedAt = monotonic()
+        mtime = self._mtime()
+        if mtime is None or mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        return self.reload()
+
+    def reload(self) -> bool:
+        """Apply the live changes of the file, returns whether anything was applied"""
+        config = self._read()
+        errors = validateConfig(config) if config is not None else ["the file cannot be read"]
+        if errors:
+            RUN_METRICS.incr("config.rejected")
+            for error in errors:
+                logging.warning(f"[CONFIG] Change rejected, {error}")
+            return False
+        settings = flattenSettings(config)
+        changed = sorted(
+            path for path in self.settings.keys() | settings.keys()
+            if self.settings.get(path, _MISSING) != settings.get(path, _MISSING)
+        )
+        live = []
+        for path in changed:
+            if not isLive(path):
+                RUN_METRICS.incr("config.restart-required")
+                logging.warning(f"[CONFIG] {path} changed, it needs a restart to apply")
+            elif path not in settings:
+                # The running code reads it without a default, e.g. retries.strategy
+                logging.warning(f"[CONFIG] {path} removed, keeping its current value")
+            else:
+                live.append(path)
+        if not live:
+            self.settings = settings
+            return False
+
+        # Sections are copied, changed and swapped in, readers see either the old or the new section
+        sections = {path.split(".")[0] for path in live}
+        previous = {section: CONFIG.get(section, _MISSING) for section in sections}
+        updated = {section: copy.deepcopy(CONFIG.get(section)) or {} for section in sections}
+        for path in live:
+            _setSetting(updated, path, settings[path])
+        CONFIG.update(updated)
+        try:
+            for applier in _appliers:
+                applier()
+        except Exception as e:
+            self._restore(previous)
+            RUN_METRICS.incr("config.rejected")
+            logging.warning(f"[CONFIG] Change rejected, applying it failed: {e!r}")
+            return False
+        self.settings = settings
+        RUN_METRICS.incr("config.reloads")
+        logging.info(f"[CONFIG] Applied {', '.join(f'{path}={settings.get(path)}' for path in live)}")
+        return True
+
+    @staticmethod
+    def _restore(previous: dict) -> None:
+        """Swap the previous sections back in and re-apply them"""
+        for section, value in previous.items():
+            if value is _MISSING:
+                CONFIG.pop(section, None)
+            else:
+                CONFIG[section] = value
+        for applier in _appliers:
+            try:
+                applier()
+            except Exception as e:
+                logging.error(f"[CONFIG] Cannot re-apply the previous settings: {e!r}")
+
+
+_watcher: ConfigWatcher | None = None
+
+
+def applyConfigChanges() -> bool:
+    """Called by the search loop at step boundaries, see the 'hot-reload' config section"""
+    global _watcher
+    if not (CONFIG.get("hot-reload") or {}).get("enabled", True):
+        return False
+    if _watcher is None:
+        _watcher = ConfigWatcher()
+        return False
+    return _watcher.poll()
@@ -0,0 +1,148 @@
+import logging
+import threading
+from time import monotonic
+from typing import NamedTuple
+from urllib.parse import urlparse
+
+import requests
+from selenium.common.exceptions import WebDriverException
+
+from src.browser import Browser
+from src.metrics import RUN_METRICS
+from src.retries import CircuitOpenError, getCircuitBreaker
+from src.utils import CONFIG
+
+USER_INFO_URL = "https://rewards.bing.com/api/getuserinfo?type=1"
+
+
+class RemainingSearches(NamedTuple):
+    desktop: int
+    mobile: int
+
+    def getTotal(self) -> int:
+        return self.desktop + self.mobile
+
+
+def pointsPerSearch(target: int) -> int:
+    """Points earned by one search, from the daily target of the counter (same rule as the dashboard)"""
+    if target in (30, 90, 102):
+        return 3
+    if target in (50, 150) or target >= 170:
+        return 5
+    return 1
+
+
+def progressOf(counters: list[dict]) -> tuple[int, int]:
+    return (
+        sum(counter["pointProgress"] for counter in counters),
+        sum(counter["pointProgressMax"] for counter in counters),
+    )
+
+
+def remainingFromStatus(status: dict) -> RemainingSearches:
+    """Remaining searches from the dashboard's userStatus, the desktop target sets the points per search"""
+    counters = status["counters"]
+    progressDesktop, targetDesktop = progressOf(counters["pcSearch"])
+    searchPoints = pointsPerSearch(targetDesktop)
+    remainingMobile = 0
+    if status["levelInfo"]["activeLevel"] != "Level1":
+        progressMobile, targetMobile = progressOf(counters["mobileSearch"])
+        remainingMobile = max(0, int((targetMobile - progressMobile) / searchPoints))
+    return RemainingSearches(max(0, int((targetDesktop - progressDesktop) / searchPoints)), remainingMobile)
+
+
+def cookieMatches(domain: str, host: str) -> bool:
+    domain = domain.lstrip(".")
+    return host == domain or host.endswith(f".{domain}")
+
+
+class RewardsCounters:
+    """
+    Remaining searches and points read from the rewards user info JSON with the browser's cookies,
+    instead of rendering the dashboard. Answers are cached for ttl seconds; the browser's
+    dashboard scraping is only used when the JSON request fails, or while its circuit is open.
+    """
+
+    def __init__(self, browser: Browser, ttl: float | None = None, url: str = USER_INFO_URL, timeout: float = 10):
+        countersConfig = CONFIG.get("counters") or {}
+        self.browser = browser
+        self.ttl = ttl if ttl is not None else countersConfig.get("cache", 5)
+        self.enabled = countersConfig.get("json", True)
+        self.url = url
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+        self.cached: dict | None = None
+        self.cachedAt = 0.0
+
+    def invalidate(self) -> None:
+        self.cached = None
+
+    def browserCookies(self) -> list[dict]:
+        """Cookies of the API host, get_cookies() only returns the ones of the current page's domain"""
+        try:
+            cookies = self.browser.webdriver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        except (AttributeError, KeyError, WebDriverException):
+            cookies = self.browser.webdriver.get_cookies()
+        host = urlparse(self.url).hostname
+        return [cookie for cookie in cookies if cookieMatches(cookie.get("domain", host), host)]
+
+    def userStatus(self) -> dict:
+        with self.lock:
+            if self.cached is not None and monotonic() - self.cachedAt < self.ttl:
+                RUN_METRICS.incr("counters.cache-hits")
+                return self.cached
+            breaker = getCircuitBreaker("counters")
+            if not breaker.allow():
+                raise CircuitOpenError("Circuit for counters is open")
+            RUN_METRICS.incr("counters.requests")
+            try:
+                with RUN_METRICS.timer("counters.fetch.seconds"):
+                    self.session.cookies.clear()
+                    for cookie in self.browserCookies():
+                        self.session.cookies.set(
+                            cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/")
+                        )
+                    response = self.session.get(
+                        self.url, headers={"User-Agent": self.browser.userAgent}, timeout=self.timeout
+                    )
+                    response.raise_for_status()
+                    self.cached = response.json()["dashboard"]["userStatus"]
+            except Exception:
+                breaker.recordFailure()
+                raise
+            breaker.recordSuccess()
+            self.cachedAt = monotonic()
+            return self.cached
+
+    def getRemainingSearches(
+        self, desktopAndMobile: bool = False, fallback: bool = True
+    ) -> RemainingSearches | int | None:
+        """Same answer as Browser.getRemainingSearches(), None when it fails and fallback is False"""
+        try:
+            if not self.enabled:
+                raise RuntimeError("JSON counters disabled")
+            remaining = remainingFromStatus(self.userStatus())
+        except Exception as e:
+            if not fallback:
+                logging.debug(f"[COUNTERS] Remaining searches unavailable: {e}")
+                return None
+            RUN_METRICS.incr("counters.fallbacks")
+            logging.debug(f"[COUNTERS] Falling back to the dashboard for the remaining searches: {e}")
+            with RUN_METRICS.timer("counters.dashboard.seconds"):
+                return self.browser.getRemainingSearches(desktopAndMobile=desktopAndMobile)
+        if desktopAndMobile:
+            return remaining
+        return remaining.mobile if self.browser.browserType == "mobile" else remaining.desktop
+
+    def getAccountPoints(self) -> int:
+        """Same answer as Utils.getAccountPoints()"""
+        try:
+            if not self.enabled:
+                raise RuntimeError("JSON counters disabled")
+            return self.userStatus()["availablePoints"]
+        except Exception as e:
+            RUN_METRICS.incr("counters.fallbacks")
+            logging.debug(f"[COUNTERS] Falling back to the dashboard for the points: {e}")
+            with RUN_METRICS.timer("counters.dashboard.seconds"):
+                return self.browser.utils.getAccountPoints()
@@ -13,6 +13,7 @@ from trendspy import Trends
 import requests
 
 from src.browser import Browser
+from src.saturation import SaturationDetector
 from src.utils import CONFIG, getProjectRoot, cooldown, COUNTRY
 
 LOAD_DATE_KEY = "loadDate"
@@ -96,7 +97,6 @@ class Searches:
                     self.googleTrendsShelf[trend] = None
             logging.debug(f"TRENDS LOADED: {list(self.googleTrendsShelf.keys())}")
 
-    # EVERYTHING BELOW THIS LINE IS IDENTICAL TO ORIGINAL v2.4
     def getGoogleTrends(self, wordsCount: int) -> list[str]:
         """Fetch trends using trendspy"""
         logging.debug("Fetching trends via trendspy...")
@@ -144,7 +144,12 @@ class Searches:
         logging.info(f"[BING] Starting {self.browser.browserType.capitalize()} Edge Bing searches...")
         self.browser.utils.goToSearch()
 
-        while True:
+        # NEW: Stop once the account's counter no longer moves with the searches
+        saturation = SaturationDetector()
+        submitted = 0
+        saturation.record(submitted, self.browser.getRemainingSearches())
+
+        while not (saturation.saturated() or saturation.credited):
             # --- SWITCH LOGIC ---
             if self.use_custom_limits and self.custom_search_limits:
                 remaining_desktop = self.custom_search_limits.get("desktop", 0)
@@ -196,7 +201,14 @@ class Searches:
                 if current_remaining <= 0:
                     break
                 
-                self.bingSearch()
+                submitted += self.bingSearch()
+                saturation.record(submitted, self.browser.getRemainingSearches())
+                if saturation.credited:
+                    logging.info("[BING] Search counter complete, nothing left to credit")
+                    break
+                if saturation.saturated():
+                    logging.warning(f"[BING] Ending early: {saturation.reason}")
+                    break
                 sleep(randint(10, 15))
 
                 # FIXED INDENTATION AND LOGIC:
@@ -213,14 +225,15 @@ class Searches:
 
         logging.info(f"[BING] Finished {self.browser.browserType.capitalize()} Edge Bing searches!")
 
-    def bingSearch(self) -> None:
+    def bingSearch(self) -> int:
+        """Search a trend and its related terms, returns the number of searches submitted"""
         availableTrends = [
             k for k in self.googleTrendsShelf.keys() 
             if k != LOAD_DATE_KEY and k.lower() not in self.usedKeywordsShelf
         ]
         if not availableTrends:
             logging.error("[BING] No unused trending keywords available globally.")
-            return
+            return 0
 
         primaryKeyword = availableTrends[0]
         relatedKeywords = self.getRelatedTerms(primaryKeyword)
@@ -236,6 +249,7 @@ class Searches:
         searchbar.send_keys(primaryKeyword)
         sleep(1)
         searchbar.submit()
+        submitted = 1
 
         # 2. Mark as used globally
         self.usedKeywordsShelf[primaryKeyword.lower()] = None
@@ -267,6 +281,7 @@ class Searches:
                 searchbar.send_keys(relatedKeyword)
                 sleep(1)
                 searchbar.submit()
+                submitted += 1
 
                 logging.info(f"[COOLDOWN] Applying cooldown after related search #{i+1}")
                 cooldown()
@@ -274,6 +289,7 @@ class Searches:
                 logging.error(f"Error searching {relatedKeyword}: {e}")
 
         logging.info(f"[BING] Completed search cycle for trend: {primaryKeyword}")
+        return submitted
 
     def __enter__(self):
         return self
@@ -1,49 +1,94 @@
-import dbm.dumb
+import contextlib
 import json
 import logging
 import shelve
-from datetime import date
-from enum import Enum, auto
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
 from random import randint, shuffle
-from time import sleep
-from typing import Final
+from time import monotonic, sleep
 
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
 from trendspy import Trends
 import requests
 
 from src.browser import Browser
-from src.utils import CONFIG, getProjectRoot, cooldown, COUNTRY
+from src.cassettes import playOrLive
+from src.configwatch import applyConfigChanges, onConfigApplied
+from src.counters import RewardsCounters
+from src.deadline import Deadline, DeadlineExceeded, callWithTimeout
+from src.handoff import emulateDevice
+from src.headless import isHeadless, matchWindowedProfile
+from src.history import installRunHistory
+from src.lightweight import BING_URL, enableLightweightMode, navigateEager
+from src.metrics import RUN_METRICS
+from src.navtiming import NavigationTimings
+from src.notifications import installNotificationDispatcher, sendNotification
+from src.profiling import profiled
+from src.resources import BrowserResourceSampler
+from src.retries import CircuitOpenError, RetriesStrategy, RetryPolicy, retry
+from src.saturation import SaturationDetector
+from src.searchplan import SearchPlan, SearchScheduler, SearchStep, buildSearchPlan
+from src.shutdown import checkShutdown, cooldown, installSignalHandlers, pause
+from src.status import getStatusBoard
+from src.stores import openStore, readTrendsSnapshot, recreateStore, storePaths, writeTrendsSnapshot
+from src.utils import CONFIG
+from src.warmup import submitWarmUp
+from src.watchdog import DriverWatchdog
 
 LOAD_DATE_KEY = "loadDate"
-GLOBAL_KEYWORDS_DB = "used_keywords"
 GLOBAL_LOAD_DATE_KEY = "globalLoadDate"  # NEW in v2.4
 SEARCH_PROGRESS_KEY = "searchProgress"
+DAILY_TRENDS_PREFETCH = 25  # Trends fetched by the warm-up when the dashboard has not been read yet
+SEARCHBAR_WAIT = 20  # Seconds per attempt, failed attempts reload the page and are retried
+
+lastSearchAt: dict[str, float] = {}  # Monotonic time of the last search per device, for the handoff gap
 
-class RetriesStrategy(Enum):
-    """Identical to original docstrings"""
-    EXPONENTIAL = auto()
-    CONSTANT = auto()
 
 class Searches:
     """
     Class to handle searches in MS Rewards.
     Version 2.4 - Added global daily reset
     """
-    maxRetries: Final[int] = CONFIG.get("retries").get("max")
-    baseDelay: Final[float] = CONFIG.get("retries").get("base_delay_in_seconds")
-    retriesStrategy = RetriesStrategy[CONFIG.get("retries").get("strategy")]
+    # NEW: Read from CONFIG by reloadSettings(), again whenever config.yaml is hot-reloaded
+    retryPolicy: RetryPolicy
+    maxRetries: int
+    baseDelay: float
+    retriesStrategy: RetriesStrategy
+    # NEW: Time budgets, see the 'deadlines' config section
+    cycleBudget: float
+    planBudget: float
+    requestTimeout: float
+    trendsTimeout: float
+    # NEW: Recoveries of a wedged WebDriver allowed for a single plan step
+    maxRecoveries: int
+
+    @classmethod
+    def reloadSettings(cls) -> None:
+        cls.retryPolicy = RetryPolicy.fromConfig()
+        cls.maxRetries = cls.retryPolicy.maxRetries
+        cls.baseDelay = cls.retryPolicy.baseDelay
+        cls.retriesStrategy = cls.retryPolicy.strategy
+        cls.cycleBudget = (CONFIG.get("deadlines") or {}).get("cycle", 180)
+        cls.planBudget = (CONFIG.get("deadlines") or {}).get("plan", 300)
+        cls.requestTimeout = (CONFIG.get("deadlines") or {}).get("request", 10)
+        cls.trendsTimeout = (CONFIG.get("deadlines") or {}).get("trends", 30)
+        cls.maxRecoveries = (CONFIG.get("watchdog") or {}).get("max-recoveries", 3)
 
     def __init__(
         self,
         browser: Browser,
         num_additional_searches=2,
         custom_search_limits=None,
-        use_custom_limits=True
+        use_custom_limits=True,
+        record_history=True
     ):
         """
         :param custom_search_limits: Dict to force search counts (e.g., {"desktop": 10, "mobile": 5})
         :param use_custom_limits: If True, uses custom_search_limits; otherwise auto-detects remaining searches.
+        :param record_history: If False, the run is left out of the history whatever the 'history' config says.
         """
         if custom_search_limits is not None:
             # 1. Dictionary check
@@ -65,55 +110,220 @@ class Searches:
         self.num_additional_searches = num_additional_searches
         self.custom_search_limits = custom_search_limits or {"desktop": 10, "mobile": 5}
         self.use_custom_limits = use_custom_limits
-
-        # Device-specific shelf (UNCHANGED)
-        dumbDbm = dbm.dumb.open((getProjectRoot() / "google_trends").__str__())
-        self.googleTrendsShelf: shelve.Shelf = shelve.Shelf(dumbDbm)
+        self.record_history = record_history
+        self.search_progress = {"desktop": 0, "mobile": 0}
+        # NEW: Construction is side-effect free, stores, trends and the plan are prepared by warmUp()
+        self.googleTrendsShelf: shelve.Shelf | None = None
+        self.usedKeywordsShelf: shelve.Shelf | None = None
+        # NEW: Stores namespaced per account, see the 'stores' config section
+        self.trendsPath, self.usedKeywordsPath = storePaths(getattr(browser, "email", None), browser.browserType)
+        self.lightweight: bool | None = None
+        # NEW: Device emulated since handOffTo(), applied again after a driver recovery
+        self.emulatedDevice: str | None = None
+        self.warm = False
+        self.warmUpFuture: Future | None = None
+        self.newDay = threading.Event()
+        self.midnightTimer: threading.Timer | None = None
+        self.watchdog: DriverWatchdog | None = None
+        # NEW: Remaining searches from the rewards JSON, the dashboard is only rendered as a fallback
+        self.counters = RewardsCounters(browser)
+        # NEW: Browser-side timings of each page, split into network, server and rendering stages
+        self.navigationTimings = NavigationTimings()
+
+    def openTrendsPool(self) -> None:
+        """Device-specific shelf of the account, for the browser's current device"""
+        self.trendsPath, _ = storePaths(getattr(self.browser, "email", None), self.browser.browserType)
+        self.googleTrendsShelf = openStore(self.trendsPath)
+
+    def openStores(self) -> None:
+        self.openTrendsPool()
     
-        # Global keyword tracker (UNCHANGED)
-        globalDbm = dbm.dumb.open((getProjectRoot() / GLOBAL_KEYWORDS_DB).__str__())
-        self.usedKeywordsShelf: shelve.Shelf = shelve.Shelf(globalDbm)
+        # Keyword tracker of the account, shared by its devices
+        self.usedKeywordsShelf = openStore(self.usedKeywordsPath)
     
         # NEW: Progress tracking initialization (only for custom mode)
         if self.use_custom_limits and self.custom_search_limits is not None:
             self.search_progress = self.usedKeywordsShelf.get("searchProgress", {"desktop": 0, "mobile": 0})
-        else:
-            self.search_progress = {"desktop": 0, "mobile": 0}  # Dummy object for auto mode
-    
+        self.dailyReset()
+
+    def dailyReset(self) -> None:
         # GLOBAL RESET LOGIC (Modified to preserve existing behavior)
         global_load_date = self.usedKeywordsShelf.get(GLOBAL_LOAD_DATE_KEY)
         if global_load_date is None or global_load_date < date.today():
-            self.usedKeywordsShelf.clear()
+            # NEW: Recreated rather than cleared, dbm.dumb never reclaims deleted keys
+            self.usedKeywordsShelf = recreateStore(self.usedKeywordsShelf, self.usedKeywordsPath)
             self.usedKeywordsShelf[GLOBAL_LOAD_DATE_KEY] = date.today()
             # NEW: Reset progress only for custom mode
             if self.use_custom_limits:
                 self.search_progress = {"desktop": 0, "mobile": 0}
                 self.usedKeywordsShelf["searchProgress"] = self.search_progress
 
-        # EXISTING LOCAL RESET (COMPLETELY UNCHANGED)
+        # EXISTING LOCAL RESET, the trends themselves are now fetched by the warm-up
         loadDate: date | None = None
         if LOAD_DATE_KEY in self.googleTrendsShelf:
             loadDate = self.googleTrendsShelf[LOAD_DATE_KEY]
 
         if loadDate is None or loadDate < date.today():
-            self.googleTrendsShelf.clear()
+            self.googleTrendsShelf = recreateStore(self.googleTrendsShelf, self.trendsPath)
             self.googleTrendsShelf[LOAD_DATE_KEY] = date.today()
-            trends = self.getGoogleTrends(
-                self.browser.getRemainingSearches(desktopAndMobile=True).getTotal()
+
+    def warmUp(self, background: bool = True) -> None:
+        """
+        Open the stores, apply the daily reset and start preparing the day: the trends fetch and,
+        in custom mode, the search plan. Only network work runs in the background; the shelves
+        and the browser are only used from the calling thread, in finishWarmUp().
+        """
+        if self.usedKeywordsShelf is None:
+            self.openStores()
+        if self.warmUpFuture is None and not self.warm:
+            device = self.browser.browserType
+            plannedSteps = 0
+            if self.use_custom_limits and self.custom_search_limits and not self.hasUnfinishedPlan():
+                plannedSteps = max(0, self.custom_search_limits[device] - self.search_progress[device])
+            pooledKeywords = [k for k in self.googleTrendsShelf.keys() if k != LOAD_DATE_KEY]
+            usedKeywords = set(self.usedKeywordsShelf.keys())
+            needTrends = len(pooledKeywords) < max(plannedSteps, 1)
+            self.warmUpFuture = submitWarmUp(
+                self.prepareDay, needTrends, plannedSteps, pooledKeywords, usedKeywords
             )
+        if not background:
+            self.finishWarmUp()
+
+    @profiled("searches-prepare-day")
+    def prepareDay(
+        self, needTrends: bool, plannedSteps: int, pooledKeywords: list[str], usedKeywords: set[str]
+    ) -> tuple[list[str], SearchPlan | None]:
+        """Network part of the warm-up, safe to run in the background"""
+        deadline = Deadline("Warm-up", self.planBudget)
+        checkShutdown()
+        trends = []
+        if needTrends:
+            trends = self.getGoogleTrends(max(DAILY_TRENDS_PREFETCH, plannedSteps + 5), deadline)
             shuffle(trends)
-            for trend in trends:
-                if trend.lower() not in self.usedKeywordsShelf:
-                    self.googleTrendsShelf[trend] = None
+            trends = [t for t in trends if t.lower() not in usedKeywords]
+        plan = None
+        if plannedSteps:
+            keywords = [k for k in dict.fromkeys(pooledKeywords + trends) if k.lower() not in usedKeywords]
+            plan = buildSearchPlan(
+                self.browser.browserType,
+                plannedSteps,
+                keywords,
+                lambda keyword: self.getRelatedTerms(keyword, deadline),
+                self.num_additional_searches,
+            )
+        return trends, plan
+
+    @profiled("searches-warm-up")
+    def finishWarmUp(self, wait: bool = True) -> None:
+        """Store what the warm-up prepared, starting it first if warmUp() was never called"""
+        if self.warmUpFuture is None:
+            if self.warm:
+                return
+            self.warmUp()
+        if not wait and not self.warmUpFuture.done():
+            return
+        trends, plan = self.warmUpFuture.result()
+        self.warmUpFuture = None
+        for trend in trends:
+            if trend.lower() not in self.usedKeywordsShelf:
+                self.googleTrendsShelf[trend] = None
+        if trends:
+            self.googleTrendsShelf[LOAD_DATE_KEY] = date.today()
             logging.debug(f"TRENDS LOADED: {list(self.googleTrendsShelf.keys())}")
-
-    # EVERYTHING BELOW THIS LINE IS IDENTICAL TO ORIGINAL v2.4
-    def getGoogleTrends(self, wordsCount: int) -> list[str]:
-        """Fetch trends using trendspy"""
+        if plan and plan.steps and not self.hasUnfinishedPlan():
+            self.saveSearchPlan(plan)
+        if self.lightweight is None:
+            self.prepareBrowser()
+        self.warm = True
+
+    def prepareBrowser(self) -> None:
+        """WebDriver setup, applied again when the watchdog restarted the driver"""
+        # NEW: Opt-in eager navigation with images, media and fonts blocked
+        self.lightweight = bool(CONFIG.get("browser").get("lightweight")) and enableLightweightMode(self.webdriver)
+        if isHeadless():
+            matchWindowedProfile(self.webdriver, mobile=self.browser.browserType == "mobile")
+        # A restarted driver or a fresh tab starts without the handoff's emulation
+        if self.emulatedDevice:
+            emulateDevice(self.browser, self.emulatedDevice)
+
+    def scheduleMidnightWarmUp(self) -> None:
+        """Prefetch the new day's trends just after midnight when the run is still going"""
+        warmUpConfig = CONFIG.get("warm-up") or {}
+        if not warmUpConfig.get("after-midnight", True):
+            return
+        midnight = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+        delay = (midnight - datetime.now()).total_seconds() + warmUpConfig.get("midnight-delay", 60)
+        self.midnightTimer = threading.Timer(delay, self.onMidnight)
+        self.midnightTimer.daemon = True
+        self.midnightTimer.start()
+
+    def onMidnight(self) -> None:
+        # Runs in the timer thread: it only signals, the search thread owns warmUpFuture
+        self.newDay.set()
+
+    def applyNewDay(self) -> None:
+        """Apply the daily reset and start the new day's prefetch at a step boundary once midnight has passed"""
+        if self.newDay.is_set():
+            self.newDay.clear()
+            logging.info("[WARM-UP] New day, resetting the keyword stores")
+            self.dailyReset()
+            if self.warmUpFuture is None:
+                # Yesterday's keywords are forgotten by the daily reset, so nothing needs to be excluded
+                self.warmUpFuture = submitWarmUp(self.prepareDay, True, 0, [], set())
+            self.scheduleMidnightWarmUp()
+        if self.warmUpFuture is not None:
+            self.finishWarmUp(wait=False)
+
+    def handOffTo(self, device: str) -> bool:
+        """
+        Continue with device in the same browser session when 'browser.handoff' is set, instead of
+        a second cold browser launch. Returns False when the caller has to launch a browser for it.
+            if searches.handOffTo("mobile"):
+                searches.bingSearches()
+        """
+        if not CONFIG.get("browser").get("handoff") or not emulateDevice(self.browser, device):
+            return False
+        self.emulatedDevice = device
+        # The new device searches from its own trends pool
+        if self.googleTrendsShelf is not None:
+            self.googleTrendsShelf.close()
+            self.openTrendsPool()
+            self.dailyReset()
+        # The new device needs its own plan, prepared while the first page loads
+        self.warm = False
+        self.warmUp(background=True)
+        return True
+
+    def hasUnfinishedPlan(self) -> bool:
+        device = self.browser.browserType
+        plan = SearchPlan.load(self.usedKeywordsShelf, device)
+        return bool(plan and plan.isFor(device, date.today()) and not plan.isDone())
+
+    def getGoogleTrends(self, wordsCount: int, deadline: Deadline | None = None) -> list[str]:
+        """Fetch trends using trendspy, or read them from today's snapshot shared by the accounts"""
+        # NEW: Another account already fetched today's trends, they are the same for every account
+        snapshot = readTrendsSnapshot(self.browser.localeGeo)
+        if len(snapshot) >= wordsCount:
+            RUN_METRICS.incr("trends.snapshot-hits")
+            return snapshot[:wordsCount]
         logging.debug("Fetching trends via trendspy...")
+        deadline = deadline or Deadline.unbounded("trends")
+
+        def live() -> list[str]:
+            return [t.keyword for t in Trends().trending_now(geo=self.browser.localeGeo)]
+
+        def fetch() -> list[str]:
+            # trendspy has no timeout of its own
+            return callWithTimeout(
+                lambda: playOrLive("trends", self.browser.localeGeo, live),
+                deadline.timeout("trends", self.trendsTimeout),
+            )
+
         try:
-            trends = Trends().trending_now(geo=self.browser.localeGeo)[:wordsCount]
-            return [t.keyword.lower() for t in trends]
+            with deadline.step("trends"):
+                trends = [t.lower() for t in retry("trends", fetch, self.retryPolicy, deadline=deadline)]
+            writeTrendsSnapshot(self.browser.localeGeo, trends)
+            return trends[:wordsCount]
         except Exception as e:
             logging.error(f"Error fetching trends: {e}")
             return []
@@ -135,40 +345,88 @@ class Searches:
         logging.error("No valid JSON found in response")
         return None
 
-    def getRelatedTerms(self, term: str) -> list[str]:
+    def getRelatedTerms(self, term: str, deadline: Deadline | None = None) -> list[str]:
         """Fetch related terms from Bing's autocomplete API"""
-        try:
+        deadline = deadline or Deadline.unbounded("autocomplete")
+
+        def live() -> str:
             response = requests.get(
                 f"https://api.bing.com/osjson.aspx?query={term}",
                 headers={"User-agent": self.browser.userAgent},
+                timeout=deadline.timeout("autocomplete", self.requestTimeout),
             )
             response.raise_for_status()
-            relatedTerms = response.json()[1]
+            return response.text
+
+        def fetch() -> list[str]:
+            # NEW: Recorded or replayed when a cassette is configured
+            return json.loads(playOrLive("autocomplete", term, live, requests.ConnectionError))[1]
+
+        try:
+            with deadline.step("autocomplete"):
+                relatedTerms = retry(
+                    "autocomplete",
+                    fetch,
+                    self.retryPolicy,
+                    retryOn=(requests.RequestException, ValueError),
+                    deadline=deadline,
+                )
             uniqueTerms = list(dict.fromkeys(relatedTerms))
             return [t for t in uniqueTerms if t.lower() != term.lower()]
-        except requests.RequestException as e:
+        except DeadlineExceeded:
+            # Degrade to a search without related terms
+            return []
+        except (requests.RequestException, ValueError, CircuitOpenError) as e:
             logging.error(f"Error fetching related terms for {term}: {e}")
             return []
 
+    @profiled("bing-searches")
     def bingSearches(self) -> None:
-        """Version 2.4.2 - Custom/Auto search modes with fixed counter updates"""
+        """Version 2.5 - Executes a precomputed daily search plan step by step"""
+        # NEW: Browser CPU/RSS is sampled for the whole phase and reported in the run metrics
+        self.watchdog = DriverWatchdog.fromConfig(self.browser)
+        with (
+            RUN_METRICS.phase(self.browser.browserType),
+            BrowserResourceSampler(self.browser),
+            self.watchdog or contextlib.nullcontext(),
+        ):
+            self.runSearchPhase()
+        self.watchdog = None
+        logging.info(f"[METRICS] {RUN_METRICS.phaseSummary(self.browser.browserType)}")
+
+    def reportStatus(self, **fields) -> None:
+        """Publish this device's status to the status endpoint, from what is already in memory"""
+        board = getStatusBoard()
+        if board is None:
+            return
+        board.publish(
+            self.browser.browserType,
+            searchProgress=dict(self.search_progress),
+            poolDepth=len(self.googleTrendsShelf) - 1,
+            **fields,
+        )
+
+    def runSearchPhase(self) -> None:
         logging.info(f"[BING] Starting {self.browser.browserType.capitalize()} Edge Bing searches...")
-        self.browser.utils.goToSearch()
+        self.finishWarmUp()
+        self.reportStatus(state="starting", mode="CUSTOM" if self.use_custom_limits and self.custom_search_limits else "AUTO")
+        self.goToSearch()
 
-        # NEW: Initialize progress tracking only for custom mode
+        # NEW: Initialize progress tracking only for custom mode. The custom limits stay the day's
+        # targets, so a second phase of the same instance (handoff) does not subtract progress twice
         if self.use_custom_limits and self.custom_search_limits:
             self.search_progress = self.usedKeywordsShelf.get("searchProgress", {"desktop": 0, "mobile": 0})
-            # Adjust initial counts based on progress
-            self.custom_search_limits["desktop"] = max(0, self.custom_search_limits["desktop"] - self.search_progress["desktop"])
-            self.custom_search_limits["mobile"] = max(0, self.custom_search_limits["mobile"] - self.search_progress["mobile"])
 
-        while True:
+        # NEW: The phase ends early once the searches stop being credited
+        saturation = SaturationDetector()
+        saturation.record(RUN_METRICS.counters["searches.submitted"], self.counters.getRemainingSearches(fallback=False))
+        while not (saturation.saturated() or saturation.credited):
             # --- SWITCH LOGIC ---
             if self.use_custom_limits and self.custom_search_limits:
-                remaining_desktop = self.custom_search_limits.get("desktop", 0)
-                remaining_mobile = self.custom_search_limits.get("mobile", 0)
+                remaining_desktop = max(0, self.custom_search_limits.get("desktop", 0) - self.search_progress["desktop"])
+                remaining_mobile = max(0, self.custom_search_limits.get("mobile", 0) - self.search_progress["mobile"])
             else:
-                remaining = self.browser.getRemainingSearches(desktopAndMobile=True)
+                remaining = self.counters.getRemainingSearches(desktopAndMobile=True)
                 remaining_desktop, remaining_mobile = remaining.desktop, remaining.mobile
 
             # Unified logging format
@@ -180,93 +438,231 @@ class Searches:
                 logging.info(f"[MODE:{mode}] Desktop: {remaining_desktop}, Mobile: {remaining_mobile}")
 
             # Unified exit condition
-            current_remaining = remaining_desktop if self.browser.browserType == "desktop" else remaining_mobile
-            if current_remaining <= 0:
+            needed_searches = remaining_desktop if self.browser.browserType == "desktop" else remaining_mobile
+            if needed_searches <= 0:
                 break
 
             logging.info(f"[BING] Remaining searches: Desktop={remaining_desktop}, Mobile={remaining_mobile}")
+            self.reportStatus(state="planning", remaining={"desktop": remaining_desktop, "mobile": remaining_mobile})
+
+            # NEW: The whole plan is computed up front, the loop below only advances its cursor
+            plan = self.getSearchPlan(needed_searches)
+            if plan.isDone():
+                logging.error("[BING] No unused trending keywords available globally.")
+                if CONFIG.get("apprise").get("notify").get("incomplete-activity"):
+                    sendNotification(
+                        "Incomplete searches",
+                        f"{self.browser.browserType.capitalize()} searches stopped with {needed_searches} left: no unused trending keywords",
+                    )
+                break
 
-            # Calculate needed searches (FIXED: removed duplicate calculation)
-            if self.use_custom_limits and self.custom_search_limits:
-                needed_searches = (
-                    self.custom_search_limits["desktop"] 
-                    if self.browser.browserType == "desktop" 
-                    else self.custom_search_limits["mobile"]
-                )
-            else:
-                needed_searches = (
-                    remaining.desktop if self.browser.browserType == "desktop" 
-                    else remaining.mobile
+            scheduler = SearchScheduler(plan, self.estimatedStepSeconds(), onAdvance=self.saveSearchPlan)
+            for step in scheduler:
+                # NEW: Live settings edited in config.yaml apply from this step on
+                applyConfigChanges()
+                self.applyNewDay()
+                logging.info(
+                    f"[PLAN] Step {plan.cursor + 1}/{len(plan.steps)} "
+                    f"({scheduler.progress:.0f}% done, ETA {timedelta(seconds=round(scheduler.eta))})"
                 )
-    
-            if (len(self.googleTrendsShelf) <= 1 or
-                len([k for k in self.googleTrendsShelf.keys() if k != LOAD_DATE_KEY]) < needed_searches):
-                logging.debug("Refreshing trends cache...")
-                trends = self.getGoogleTrends(needed_searches + 5)
-                shuffle(trends)
-                for trend in trends:
-                    if trend.lower() not in self.usedKeywordsShelf:
-                        self.googleTrendsShelf[trend] = None
-                self.googleTrendsShelf[LOAD_DATE_KEY] = date.today()
-    
-                logging.debug(
-                    f"BUFFER STATUS: Needed={needed_searches}, "
-                    f"Loaded={len(trends)}, "
-                    f"Now in shelf={len(self.googleTrendsShelf)-1}"
+                self.runStep(step, f"Cycle {plan.cursor + 1}")
+                # Read without the dashboard fallback, a failed read is simply not recorded
+                saturation.record(
+                    RUN_METRICS.counters["searches.submitted"], self.counters.getRemainingSearches(fallback=False)
                 )
-
-            for _ in range(needed_searches):
-                current_remaining = remaining_desktop if self.browser.browserType == "desktop" else remaining_mobile
-                if current_remaining <= 0:
-                    break
-        
-                self.bingSearch()
-                sleep(randint(10, 15))
-
-                # FIXED INDENTATION AND LOGIC:
                 if self.use_custom_limits and self.custom_search_limits:
-                    if self.browser.browserType == "desktop":
-                        self.custom_search_limits["desktop"] = max(0, self.custom_search_limits["desktop"] - 1)
-                        remaining_desktop = self.custom_search_limits["desktop"]
-                        # NEW: Update progress tracking
-                        self.search_progress["desktop"] += 1
-                    else:
-                        self.custom_search_limits["mobile"] = max(0, self.custom_search_limits["mobile"] - 1)
-                        remaining_mobile = self.custom_search_limits["mobile"]
-                        # NEW: Update progress tracking
-                        self.search_progress["mobile"] += 1
+                    device = self.browser.browserType
+                    self.search_progress[device] += 1
                     # NEW: Save progress after each search
                     self.usedKeywordsShelf["searchProgress"] = self.search_progress
-                    self.usedKeywordsShelf.sync()
-                    logging.debug(f"[MODE:{mode}] Counters - Desktop: {remaining_desktop}, Mobile: {remaining_mobile}")
-                else:
-                    remaining = self.browser.getRemainingSearches(desktopAndMobile=True)
+                    logging.debug(f"[MODE:{mode}] Progress - Desktop: {self.search_progress['desktop']}/{self.custom_search_limits['desktop']}, Mobile: {self.search_progress['mobile']}/{self.custom_search_limits['mobile']}")
+                self.reportStatus(
+                    state="searching",
+                    # The scheduler advances the cursor after this body, the current step is done
+                    plan={
+                        "stepsDone": plan.cursor + 1,
+                        "steps": len(plan.steps),
+                        "progress": round(100.0 * (plan.cursor + 1) / len(plan.steps), 1),
+                        "eta": round(scheduler.eta),
+                    },
+                )
+                if saturation.saturated() or saturation.credited:
+                    # Stopped through the scheduler so this last step is still advanced and saved
+                    scheduler.stop()
+                    continue
+                # NEW: Interrupted by SIGTERM/SIGINT, the progress is then flushed by __exit__
+                with RUN_METRICS.timer("cooldown.seconds"):
+                    pause(randint(10, 15))
+
+        if saturation.credited:
+            logging.info(f"[BING] {self.browser.browserType.capitalize()} search counter complete, nothing left to credit")
+        self.reportStatus(state="saturated" if saturation.reason else "finished", endReason=saturation.reason)
+        if saturation.reason:
+            logging.warning(f"[BING] {self.browser.browserType.capitalize()} searches ended early: {saturation.reason}")
+            if CONFIG.get("apprise").get("notify").get("incomplete-activity"):
+                sendNotification(
+                    "Searches not credited",
+                    f"{self.browser.browserType.capitalize()} searches ended early: {saturation.reason}",
+                )
 
         logging.info(f"[BING] Finished {self.browser.browserType.capitalize()} Edge Bing searches!")
 
-    def bingSearch(self) -> None:
-        availableTrends = [
-            k for k in self.googleTrendsShelf.keys() 
+    def runStep(self, step: SearchStep, name: str) -> None:
+        """Run a plan step, and run it again after the watchdog recovered a wedged WebDriver"""
+        for recoveries in range(self.maxRecoveries + 1):
+            deadline = Deadline(name, self.cycleBudget)
+            failed = False
+            try:
+                with self.watchdog.watching(name) if self.watchdog else contextlib.nullcontext():
+                    self.bingSearch(step, deadline)
+            except Exception:
+                if not (self.watchdog and self.watchdog.tripped) or recoveries == self.maxRecoveries:
+                    raise
+                failed = True
+            if deadline.overruns:
+                logging.warning(f"[DEADLINE] {deadline.name} overran its budget at: {', '.join(deadline.overruns)}")
+            if self.watchdog and self.watchdog.tripped:
+                self.recoverDriver()
+            if not failed:
+                return
+            logging.info(f"[WATCHDOG] Resuming at {name}")
+
+    def recoverDriver(self) -> None:
+        self.watchdog.recover()
+        self.webdriver = self.browser.webdriver
+        self.prepareBrowser()
+
+    def heartbeat(self) -> None:
+        if self.watchdog:
+            self.watchdog.beat()
+
+    def idle(self) -> contextlib.AbstractContextManager:
+        """Cooldowns and retry waits are not progress the watchdog should expect"""
+        return self.watchdog.idle() if self.watchdog else contextlib.nullcontext()
+
+    def refreshTrendsPool(self, needed_searches: int, deadline: Deadline | None = None) -> None:
+        """Top up the trends shelf when it holds fewer keywords than needed"""
+        if (len(self.googleTrendsShelf) <= 1 or
+            len([k for k in self.googleTrendsShelf.keys() if k != LOAD_DATE_KEY]) < needed_searches):
+            logging.debug("Refreshing trends cache...")
+            trends = self.getGoogleTrends(needed_searches + 5, deadline)
+            shuffle(trends)
+            for trend in trends:
+                if trend.lower() not in self.usedKeywordsShelf:
+                    self.googleTrendsShelf[trend] = None
+            self.googleTrendsShelf[LOAD_DATE_KEY] = date.today()
+
+            logging.debug(
+                f"BUFFER STATUS: Needed={needed_searches}, "
+                f"Loaded={len(trends)}, "
+                f"Now in shelf={len(self.googleTrendsShelf)-1}"
+            )
+
+    def getSearchPlan(self, needed_searches: int) -> SearchPlan:
+        """Resume today's unfinished plan for this device, or build and persist a new one"""
+        device = self.browser.browserType
+        plan = SearchPlan.load(self.usedKeywordsShelf, device)
+        if plan and plan.isFor(device, date.today()) and not plan.isDone():
+            del plan.steps[plan.cursor + needed_searches:]
+            logging.info(f"[PLAN] Resuming {device} plan at step {plan.cursor + 1}/{len(plan.steps)}")
+            return plan
+
+        # Past the planning budget, the remaining steps are planned without related terms
+        deadline = Deadline("Planning", self.planBudget)
+        self.refreshTrendsPool(needed_searches, deadline)
+        availableTrends = (
+            k for k in self.googleTrendsShelf.keys()
             if k != LOAD_DATE_KEY and k.lower() not in self.usedKeywordsShelf
-        ]
-        if not availableTrends:
-            logging.error("[BING] No unused trending keywords available globally.")
-            return
+        )
+        plan = buildSearchPlan(
+            device,
+            needed_searches,
+            availableTrends,
+            lambda keyword: self.getRelatedTerms(keyword, deadline),
+            self.num_additional_searches,
+        )
+        self.saveSearchPlan(plan)
+        return plan
+
+    def saveSearchPlan(self, plan: SearchPlan) -> None:
+        plan.save(self.usedKeywordsShelf)
+        self.usedKeywordsShelf.sync()
+
+    def estimatedStepSeconds(self) -> float:
+        """Expected duration of one plan step before any step has been measured"""
+        cooldownConfig = CONFIG.get("cooldown")
+        meanCooldown = (cooldownConfig.get("min") + cooldownConfig.get("max")) / 2
+        # Each search types for 2s then cools down, plus the 10-15s pause between steps
+        return (1 + self.num_additional_searches) * (meanCooldown + 2) + 12.5
+
+    def goToSearch(self, timeout: float | None = None) -> None:
+        if self.lightweight:
+            navigateEager(self.webdriver, BING_URL, timeout or SEARCHBAR_WAIT)
+        elif timeout is None:
+            self.browser.utils.goToSearch()
+        else:
+            previous = self.webdriver.timeouts.page_load
+            self.webdriver.set_page_load_timeout(timeout)
+            try:
+                self.browser.utils.goToSearch()
+            finally:
+                self.webdriver.set_page_load_timeout(previous)
+
+    def openSearchbar(self, deadline: Deadline, mandatory: bool = False) -> WebElement:
+        """Load the search page and wait for the search box, reloading on timeouts"""
+        def attempt() -> WebElement:
+            self.heartbeat()
+            with RUN_METRICS.timer("step.navigation.seconds"):
+                self.goToSearch(deadline.timeout("navigation", SEARCHBAR_WAIT, mandatory))
+            with RUN_METRICS.timer("step.searchbar-wait.seconds"):
+                searchbar = self.browser.utils.waitUntilClickable(
+                    By.ID, "sb_form_q", timeToWait=deadline.timeout("searchbar", SEARCHBAR_WAIT, mandatory)
+                )
+            self.navigationTimings.record(self.webdriver, "search")
+            return searchbar
+
+        with deadline.step("searchbar"):
+            return retry(
+                "searchbar",
+                attempt,
+                self.retryPolicy,
+                retryOn=(TimeoutException,),
+                wait=self.watchdog.rest if self.watchdog else pause,
+                deadline=deadline,
+                # A slow search box is a local wait, it must not trip a process-wide breaker
+                useBreaker=False,
+            )
 
-        primaryKeyword = availableTrends[0]
-        relatedKeywords = self.getRelatedTerms(primaryKeyword)
+    def submitSearch(self, searchbar: WebElement, keyword: str) -> None:
+        self.heartbeat()
+        with RUN_METRICS.timer("step.typing.seconds"):
+            searchbar.clear()
+            sleep(1)
+            searchbar.send_keys(keyword)
+            sleep(1)
+        with RUN_METRICS.timer("step.submit.seconds"):
+            searchbar.submit()
+        RUN_METRICS.incr("searches.submitted")
+        self.navigationTimings.record(self.webdriver, "results")
+        # NEW: Gap between the last desktop search and the first mobile one
+        device = self.browser.browserType
+        if device == "mobile" and "desktop" in lastSearchAt:
+            gap = monotonic() - lastSearchAt.pop("desktop")
+            RUN_METRICS.observe("handoff.seconds", gap)
+            logging.info(f"[HANDOFF] First mobile search {gap:.1f}s after the last desktop search")
+        lastSearchAt[device] = monotonic()
+
+    def bingSearch(self, step: SearchStep, deadline: Deadline | None = None) -> None:
+        primaryKeyword = step.primaryKeyword
+        relatedKeywords = list(step.relatedTerms)
+        deadline = deadline or Deadline.unbounded("Cycle")
 
         logging.debug(f"PRIMARY KEYWORD: {primaryKeyword}, REMAINING TRENDS: {len(self.googleTrendsShelf)-1}")
         logging.debug(f"GLOBAL USAGE COUNT: {len(self.usedKeywordsShelf)}")
 
         # 1. Perform primary search first
-        self.browser.utils.goToSearch()
-        searchbar = self.browser.utils.waitUntilClickable(By.ID, "sb_form_q", timeToWait=60)
-        searchbar.clear()
-        sleep(1)
-        searchbar.send_keys(primaryKeyword)
-        sleep(1)
-        searchbar.submit()
+        searchbar = self.openSearchbar(deadline, mandatory=True)
+        self.submitSearch(searchbar, primaryKeyword)
 
         # 2. Mark as used globally
         self.usedKeywordsShelf[primaryKeyword.lower()] = None
@@ -278,7 +674,8 @@ class Searches:
             logging.debug(f"POST-DELETION SHELF: {list(self.googleTrendsShelf.keys())}")
 
         logging.info("[COOLDOWN] Applying cooldown after primary search")
-        cooldown()
+        with deadline.paused(), self.idle():
+            cooldown()
 
         # 4. Show related terms summary
         logging.debug(
@@ -286,38 +683,55 @@ class Searches:
             f"{relatedKeywords[:10]}"
         )
 
-        # 5. Additional searches
-        for i in range(min(self.num_additional_searches, len(relatedKeywords))):
-            relatedKeyword = relatedKeywords.pop(0)
+        # 5. Additional searches, already limited to num_additional_searches by the plan
+        for i, relatedKeyword in enumerate(relatedKeywords):
             logging.debug(f"Searching related keyword #{i+1}: {relatedKeyword}")
             try:
-                self.browser.utils.goToSearch()
-                searchbar = self.browser.utils.waitUntilClickable(By.ID, "sb_form_q", timeToWait=60)
-                searchbar.clear()
-                sleep(1)
-                searchbar.send_keys(relatedKeyword)
-                sleep(1)
-                searchbar.submit()
+                searchbar = self.openSearchbar(deadline)
+                self.submitSearch(searchbar, relatedKeyword)
 
                 logging.info(f"[COOLDOWN] Applying cooldown after related search #{i+1}")
-                cooldown()
+                with deadline.paused(), self.idle():
+                    cooldown()
+            except DeadlineExceeded:
+                # NEW: Out of budget, the remaining related searches are skipped
+                logging.warning(f"[DEADLINE] Skipping {len(relatedKeywords) - i} related searches")
+                break
             except Exception as e:
                 logging.error(f"Error searching {relatedKeyword}: {e}")
 
         logging.info(f"[BING] Completed search cycle for trend: {primaryKeyword}")
 
     def __enter__(self):
+        installSignalHandlers()
+        installNotificationDispatcher()
+        if self.record_history:
+            installRunHistory()
+        # NEW: Takes the config.yaml baseline on the first call, later calls apply its changes
+        applyConfigChanges()
+        # NEW: Trends and the plan are prepared in the background while the caller gets ready
+        self.warmUp(background=True)
+        self.scheduleMidnightWarmUp()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Ensure progress is saved when exiting"""
+        if self.midnightTimer:
+            self.midnightTimer.cancel()
+        if self.warmUpFuture:
+            self.warmUpFuture.cancel()
+        # NEW: The stores are only opened by the warm-up
+        if self.usedKeywordsShelf is None:
+            return
         # NEW: Only save progress if in custom mode
-        if (hasattr(self, 'use_custom_limits') and 
-            self.use_custom_limits and 
-            hasattr(self, 'search_progress')):
+        if self.use_custom_limits:
             self.usedKeywordsShelf["searchProgress"] = self.search_progress
             self.usedKeywordsShelf.sync()  # Force immediate save
     
         # Original closing logic remains unchanged
         self.googleTrendsShelf.close()
         self.usedKeywordsShelf.close()
+
+
+Searches.reloadSettings()
+onConfigApplied(Searches.reloadSettings)
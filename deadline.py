@@ -0,0 +1,124 @@
+import contextlib
+import logging
+import threading
+from math import inf
+from time import monotonic
+from typing import Callable, Iterator, TypeVar
+
+from src.metrics import RUN_METRICS
+from src.shutdown import checkShutdown
+
+T = TypeVar("T")
+
+MIN_TIMEOUT = 5.0  # Seconds always granted to a mandatory step, even past the deadline
+JOIN_SLICE = 0.5  # Seconds between two shutdown checks while waiting for a call
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of starting a step once the budget of its cycle is spent"""
+
+
+class CallTimeout(Exception):
+    """
+    Raised by callWithTimeout when a single call runs past its own cap. Unlike DeadlineExceeded
+    it is an endpoint failure: it is retried and counted by the endpoint's circuit breaker.
+    """
+
+
+class Deadline:
+    """
+    Time budget of a search cycle. Each external call asks it for its timeout, which is the
+    remaining budget capped by the call's own limit. Cooldowns run inside paused() so only
+    network and page work is charged to the budget.
+    """
+
+    def __init__(self, name: str, budget: float):
+        self.name = name
+        self.budget = budget
+        self.spent = 0.0
+        self.runningSince: float | None = monotonic()
+        self.overruns: list[str] = []
+
+    @classmethod
+    def unbounded(cls, name: str) -> "Deadline":
+        return cls(name, inf)
+
+    def elapsed(self) -> float:
+        running = monotonic() - self.runningSince if self.runningSince is not None else 0.0
+        return self.spent + running
+
+    def remaining(self) -> float:
+        return max(0.0, self.budget - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def overrun(self, step: str) -> None:
+        if step in self.overruns:
+            return
+        self.overruns.append(step)
+        RUN_METRICS.incr(f"deadline.{step}.overruns")
+        logging.warning(f"[DEADLINE] {self.name} budget of {self.budget}s overrun at step '{step}'")
+
+    def timeout(self, step: str, cap: float, mandatory: bool = False) -> float:
+        """
+        Timeout for the next call of step. Raises DeadlineExceeded when the budget is spent,
+        unless the step is mandatory, in which case it still gets MIN_TIMEOUT seconds.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.overrun(step)
+            if not mandatory:
+                raise DeadlineExceeded(f"{self.name} budget spent before '{step}'")
+            return min(cap, MIN_TIMEOUT)
+        return min(cap, remaining)
+
+    @contextlib.contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time a step and report it as an overrun if the budget ran out during it"""
+        start = monotonic()
+        try:
+            yield
+        finally:
+            RUN_METRICS.observe(f"step.{name}.seconds", monotonic() - start)
+            if self.expired():
+                self.overrun(name)
+
+    @contextlib.contextmanager
+    def paused(self) -> Iterator[None]:
+        if self.runningSince is None:
+            yield
+            return
+        self.spent += monotonic() - self.runningSince
+        self.runningSince = None
+        try:
+            yield
+        finally:
+            self.runningSince = monotonic()
+
+
+def callWithTimeout(function: Callable[[], T], timeout: float) -> T:
+    """
+    Run a call that has no timeout of its own in a worker thread and stop waiting after timeout.
+    The worker cannot be killed, it is abandoned as a daemon thread.
+    """
+    outcome: dict[str, object] = {}
+
+    def target() -> None:
+        try:
+            outcome["result"] = function()
+        except BaseException as e:
+            outcome["error"] = e
+
+    worker = threading.Thread(target=target, name="timeout-call", daemon=True)
+    worker.start()
+    # Joined in slices so a shutdown does not wait for the whole timeout
+    end = monotonic() + timeout
+    while worker.is_alive() and monotonic() < end:
+        worker.join(min(JOIN_SLICE, end - monotonic()))
+        checkShutdown()
+    if worker.is_alive():
+        raise CallTimeout(f"call did not finish within {timeout:.1f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
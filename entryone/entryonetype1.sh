@@ -62,6 +62,13 @@ install_packages
 # Install Python dependencies
 install_python_dependencies
 
+# Headless when the config hides the browser ('visible: false'), no virtual display is needed then
+if grep -Eq '^\s*visible:\s*false' /app/config.yaml; then
+    HEADLESS=true
+else
+    HEADLESS=false
+fi
+
 # Remove temp file when previous execution crashed
 rm -f /tmp/.X99-lock
 
@@ -72,9 +79,14 @@ export DBUS_SESSION_BUS_ADDRESS=/dev/null
 # Display IP and system information
 display_ip_info
 
-# Start virtual display
-Xvfb $DISPLAY -screen 0 1280x800x16 -nolisten tcp &
-sleep 10  # Allow time for Xvfb to start
+# Start virtual display, skipped in headless mode
+if [ "$HEADLESS" = true ]; then
+    echo "Headless browser, skipping Xvfb"
+    unset DISPLAY
+else
+    Xvfb $DISPLAY -screen 0 1280x800x16 -nolisten tcp &
+    sleep 10  # Allow time for Xvfb to start
+fi
 
 # Kill all related processes again before running
 kill_related_processes
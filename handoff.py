@@ -0,0 +1,115 @@
+import logging
+import re
+
+from selenium.common.exceptions import WebDriverException
+
+from src.browser import Browser
+
+# A mid-range Android phone, close to what the mobile browser profile reports
+MOBILE_METRICS = {"width": 412, "height": 915, "deviceScaleFactor": 2.625, "mobile": True}
+MOBILE_USER_AGENT = (
+    "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/{version} Mobile Safari/537.36 EdgA/{version}"
+)
+# Client hints of that phone, the reduced user agent only says "Android 10; K"
+MOBILE_PLATFORM_VERSION = "10.0.0"
+MOBILE_MODEL = "SM-A515F"
+MOBILE_NAVIGATOR_PLATFORM = "Linux armv81"
+
+
+def mobileUserAgent(desktopUserAgent: str) -> str:
+    """Mobile user agent of the same browser version as desktopUserAgent"""
+    return MOBILE_USER_AGENT.format(version=chromeVersion(desktopUserAgent))
+
+
+def chromeVersion(userAgent: str) -> str:
+    match = re.search(r"Chrome/([\d.]+)", userAgent)
+    return match.group(1) if match else "120.0.0.0"
+
+
+def desktopPlatform(userAgent: str) -> tuple[str, str]:
+    """(client hints platform, navigator.platform) of a desktop user agent"""
+    if "Macintosh" in userAgent:
+        return "macOS", "MacIntel"
+    if "Linux" in userAgent:
+        return "Linux", "Linux x86_64"
+    return "Windows", "Win32"
+
+
+def userAgentMetadata(userAgent: str, mobile: bool, desktopMetadata: dict | None = None) -> dict:
+    """
+    Client hints (Sec-CH-UA-*) matching userAgent. The brands come from the desktop profile's metadata
+    when the browser has one, so both devices advertise the same browser.
+    """
+    version = chromeVersion(userAgent)
+    edge = re.search(r"EdgA?/([\d.]+)", userAgent)
+    edgeVersion = edge.group(1) if edge else version
+    metadata = {
+        "brands": [
+            {"brand": "Not/A)Brand", "version": "99"},
+            {"brand": "Microsoft Edge", "version": edgeVersion.split(".")[0]},
+            {"brand": "Chromium", "version": version.split(".")[0]},
+        ],
+        "fullVersionList": [
+            {"brand": "Not/A)Brand", "version": "99.0.0.0"},
+            {"brand": "Microsoft Edge", "version": edgeVersion},
+            {"brand": "Chromium", "version": version},
+        ],
+        "platform": desktopPlatform(userAgent)[0],
+        "platformVersion": "10.0.0",
+        "architecture": "x86",
+        "bitness": "64",
+        "model": "",
+        "mobile": False,
+    }
+    if desktopMetadata:
+        metadata.update(desktopMetadata)
+    if mobile:
+        metadata.update(
+            platform="Android", platformVersion=MOBILE_PLATFORM_VERSION, architecture="", bitness="",
+            model=MOBILE_MODEL, mobile=True,
+        )
+    return metadata
+
+
+def emulateDevice(browser: Browser, device: str) -> bool:
+    """
+    Switch the browser session to the desktop or mobile profile in place, through user agent,
+    device metrics and touch emulation, instead of launching a second browser.
+    The client hints follow the user agent, so Sec-CH-UA-Mobile and the platform match it.
+    """
+    webdriver = browser.webdriver
+    if not hasattr(browser, "desktopUserAgent"):
+        isDesktop = browser.browserType == "desktop"
+        browser.desktopUserAgent = browser.userAgent if isDesktop else None
+        browser.desktopUserAgentMetadata = getattr(browser, "userAgentMetadata", None) if isDesktop else None
+    try:
+        if device == "mobile":
+            userAgent = mobileUserAgent(browser.desktopUserAgent or browser.userAgent)
+            metadata = userAgentMetadata(userAgent, True, browser.desktopUserAgentMetadata)
+            webdriver.execute_cdp_cmd(
+                "Emulation.setUserAgentOverride",
+                {"userAgent": userAgent, "platform": MOBILE_NAVIGATOR_PLATFORM, "userAgentMetadata": metadata},
+            )
+            webdriver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", MOBILE_METRICS)
+            webdriver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": True, "maxTouchPoints": 5})
+        elif browser.desktopUserAgent:
+            userAgent = browser.desktopUserAgent
+            metadata = userAgentMetadata(userAgent, False, browser.desktopUserAgentMetadata)
+            webdriver.execute_cdp_cmd(
+                "Emulation.setUserAgentOverride",
+                {"userAgent": userAgent, "platform": desktopPlatform(userAgent)[1], "userAgentMetadata": metadata},
+            )
+            webdriver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+            webdriver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": False})
+        else:
+            raise ValueError("the desktop user agent of a browser started as mobile is unknown")
+    except (AttributeError, ValueError, WebDriverException) as e:
+        logging.warning(f"[HANDOFF] Cannot switch the browser to {device}: {e}")
+        return False
+    browser.userAgent = userAgent
+    browser.userAgentMetadata = metadata
+    browser.browserType = device
+    browser.mobile = device == "mobile"
+    logging.info(f"[HANDOFF] Browser session switched to {device}")
+    return True
@@ -0,0 +1,40 @@
+import logging
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.utils import CONFIG
+
+WINDOW_SIZE = (1280, 800)  # Screen of the launchers' Xvfb display, a headless window gets the same size
+
+
+def isHeadless() -> bool:
+    """Headless is the browser hidden with 'browser.visible: false', no X display is needed then"""
+    return not CONFIG.get("browser").get("visible", True)
+
+
+def headlessArguments() -> list[str]:
+    """Chromium arguments of a headless browser with the same window as on the Xvfb display"""
+    width, height = WINDOW_SIZE
+    return ["--headless=new", f"--window-size={width},{height}"]
+
+
+def matchWindowedProfile(webdriver: WebDriver, mobile: bool = False) -> bool:
+    """
+    Remove what sets a headless browser apart from a windowed one: 'HeadlessChrome' in its user agent,
+    and for a desktop browser a window of another size than the Xvfb screen. A mobile browser keeps
+    the size of its device metrics.
+    """
+    try:
+        userAgent = webdriver.execute_script("return navigator.userAgent")
+        if "HeadlessChrome" in userAgent:
+            webdriver.execute_cdp_cmd(
+                "Emulation.setUserAgentOverride", {"userAgent": userAgent.replace("HeadlessChrome", "Chrome")}
+            )
+        if not mobile:
+            width, height = WINDOW_SIZE
+            webdriver.set_window_size(width, height)
+    except (AttributeError, WebDriverException) as e:
+        logging.warning(f"[HEADLESS] Cannot match the windowed browser profile: {e}")
+        return False
+    return True
@@ -0,0 +1,206 @@
+import argparse
+import atexit
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from time import monotonic
+
+from src.metrics import RUN_METRICS, RunMetrics
+from src.status import cacheHitRates
+from src.utils import CONFIG, getProjectRoot
+
+HISTORY_FILE = "history/runs.jsonl"
+# Set it to 0 to run without recording, e.g. for benchmarks and tests, whatever the config says
+HISTORY_ENV = "MS_REWARDS_HISTORY"
+# Metrics kept in the history are the ones that explain a slower run, the other series stay in the logs
+HISTORY_PREFIXES = ("step.", "counters.", "navigation.", "handoff.", "browser.launch.", "watchdog.")
+
+_installed = False
+
+
+def historyPath() -> Path:
+    return getProjectRoot() / HISTORY_FILE
+
+
+def phaseRecord(phaseSeconds: float, metrics: dict) -> dict:
+    """Compact summary of one phase: latency percentiles, round-trips, bytes and active/cooldown time"""
+    cooldown = metrics.get("cooldown.seconds", {}).get("total", 0.0)
+    transferBytes = sum(
+        stats["total"] for name, stats in metrics.items()
+        if name.startswith("navigation.") and name.endswith(".transferBytes")
+    )
+    return {
+        "seconds": round(phaseSeconds, 1),
+        "active": round(max(0.0, phaseSeconds - cooldown), 1),
+        "cooldown": round(cooldown, 1),
+        "dashboardRoundTrips": metrics.get("counters.dashboard.seconds", {}).get("count", 0),
+        "transferBytes": int(transferBytes),
+        "latency": {
+            name.removesuffix(".seconds"): [
+                round(stats["p50"], 3), round(stats["p90"], 3), round(stats["p99"], 3), stats["count"]
+            ]
+            for name, stats in sorted(metrics.items())
+            if name.endswith(".seconds") and name.startswith(HISTORY_PREFIXES)
+        },
+    }
+
+
+def runRecord(startedAt: datetime, wallSeconds: float, metrics: RunMetrics = RUN_METRICS) -> dict:
+    summary = metrics.summary()
+    counters = summary["counters"]
+    return {
+        "started": startedAt.isoformat(timespec="seconds"),
+        "seconds": round(wallSeconds, 1),
+        "searches": counters.get("searches.submitted", 0),
+        "cacheHitRates": {name: round(rate, 3) for name, rate in cacheHitRates(counters).items()},
+        "phases": {
+            phase: phaseRecord(data["seconds"], data["metrics"])
+            for phase, data in summary["phases"].items()
+            if data["seconds"]
+        },
+    }
+
+
+def appendRunRecord(record: dict, path: Path | None = None, maxRuns: int | None = None) -> None:
+    """Append record to the history, dropping the oldest records past maxRuns"""
+    path = path or historyPath()
+    if maxRuns is None:
+        maxRuns = (CONFIG.get("history") or {}).get("max-runs", 1000)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(record, separators=(",", ":")) + "\n")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    if maxRuns and len(lines) > maxRuns:
+        path.write_text("\n".join(lines[-maxRuns:]) + "\n", encoding="utf-8")
+
+
+def loadHistory(path: Path | None = None) -> list[dict]:
+    path = path or historyPath()
+    if not path.exists():
+        return []
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            logging.warning(f"[HISTORY] Skipping a corrupt record of {path}")
+    return records
+
+
+def historyEnabled() -> bool:
+    if os.environ.get(HISTORY_ENV, "").lower() in ("0", "false", "off"):
+        return False
+    return (CONFIG.get("history") or {}).get("enabled", True)
+
+
+def installRunHistory() -> None:
+    """Append the run's record to the history when the process exits, see the 'history' config section"""
+    global _installed
+    if _installed or not historyEnabled():
+        return
+    _installed = True
+    startedAt, start = datetime.now(), monotonic()
+
+    def record() -> None:
+        try:
+            appendRunRecord(runRecord(startedAt, monotonic() - start))
+        except Exception as e:
+            logging.warning(f"[HISTORY] Run not recorded: {e}")
+
+    atexit.register(record)
+
+
+def flatten(record: dict) -> dict[str, float]:
+    """Comparable values of a record, e.g. 'desktop.step.searchbar.p90' or 'desktop.active'"""
+    values = {"seconds": record["seconds"], "searches": record["searches"]}
+    for name, rate in record.get("cacheHitRates", {}).items():
+        values[f"cacheHitRate.{name}"] = rate
+    for phase, data in record.get("phases", {}).items():
+        for key in ("active", "cooldown", "dashboardRoundTrips", "transferBytes"):
+            values[f"{phase}.{key}"] = data[key]
+        for name, (p50, p90, p99, _) in data["latency"].items():
+            values[f"{phase}.{name}.p50"] = p50
+            values[f"{phase}.{name}.p90"] = p90
+    return values
+
+
+def formatValue(value: float) -> str:
+    return f"{value:.3f}" if abs(value) < 1000 else f"{value:.0f}"
+
+
+def higherIsBetter(name: str) -> bool:
+    return name.startswith("cacheHitRate.") or name == "searches"
+
+
+def regressions(records: list[dict], window: int, threshold: float) -> list[tuple[str, float, float, float]]:
+    """(metric, baseline, latest, change) for the latest run against the median of the previous window runs"""
+    if len(records) < 2:
+        return []
+    latest = flatten(records[-1])
+    previous = [flatten(record) for record in records[-window - 1:-1]]
+    found = []
+    for name, value in latest.items():
+        history = [values[name] for values in previous if name in values]
+        if not history:
+            continue
+        baseline = median(history)
+        if not baseline:
+            continue
+        change = (value - baseline) / baseline
+        if (-change if higherIsBetter(name) else change) > threshold:
+            found.append((name, baseline, value, change))
+    return sorted(found, key=lambda regression: abs(regression[3]), reverse=True)
+
+
+def dailyTrends(records: list[dict], days: int, metrics: list[str]) -> tuple[list[str], dict[str, dict[str, float]]]:
+    """Median of each metric per day over the last days days"""
+    byDay: dict[str, list[dict]] = {}
+    for record in records:
+        byDay.setdefault(record["started"][:10], []).append(flatten(record))
+    lastDays = sorted(byDay)[-days:]
+    trends: dict[str, dict[str, float]] = {}
+    for day in lastDays:
+        for name in sorted({name for values in byDay[day] for name in values}):
+            if metrics and not name.startswith(tuple(metrics)):
+                continue
+            dayValues = [values[name] for values in byDay[day] if name in values]
+            trends.setdefault(name, {})[day] = median(dayValues)
+    return lastDays, trends
+
+
+if __name__ == "__main__":
+    # Compare the last run with the previous ones and print the daily medians:
+    # python -m src.history --days 7 --runs 10 --threshold 0.2 --metric desktop.step
+    parser = argparse.ArgumentParser(description="Report regressions and trends across the recorded runs")
+    parser.add_argument("--file", type=Path, help=f"History file, {HISTORY_FILE} by default")
+    parser.add_argument("--days", type=int, default=7, help="Days shown in the trends")
+    parser.add_argument("--runs", type=int, default=10, help="Previous runs the last run is compared with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative change reported as a regression")
+    parser.add_argument("--metric", action="append", default=[], help="Only show metrics starting with this prefix")
+    arguments = parser.parse_args()
+
+    runs = loadHistory(arguments.file)
+    if not runs:
+        print(f"[HISTORY] No run recorded in {arguments.file or historyPath()}")
+        raise SystemExit(0)
+    print(f"[HISTORY] {len(runs)} runs, last started {runs[-1]['started']}")
+
+    days, dayMedians = dailyTrends(runs, arguments.days, arguments.metric)
+    width = max(len(name) for name in dayMedians) if dayMedians else 10
+    print(f"{'metric':<{width}} " + " ".join(f"{day[5:]:>11}" for day in days))
+    for name, medians in dayMedians.items():
+        print(f"{name:<{width}} " + " ".join(
+            f"{formatValue(medians[day]) if day in medians else '-':>11}" for day in days
+        ))
+
+    found = [
+        regression for regression in regressions(runs, arguments.runs, arguments.threshold)
+        if not arguments.metric or regression[0].startswith(tuple(arguments.metric))
+    ]
+    print(f"[HISTORY] {len(found)} regressions of the last run over {arguments.threshold:.0%}")
+    for name, baseline, value, change in found:
+        print(f"  {name}: {formatValue(baseline)} -> {formatValue(value)} ({change:+.0%})")
+    raise SystemExit(1 if found else 0)
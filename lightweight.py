@@ -0,0 +1,40 @@
+import logging
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+BING_URL = "https://www.bing.com/"
+
+# Images, media and fonts are never needed to type a search and submit it
+# Patterns match the whole URL, the trailing wildcard keeps them matching with a query string
+BLOCKED_URL_PATTERNS = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*",
+    "*.woff*", "*.ttf*", "*.otf*",
+    "*bing.com/th?*", "*bing.com/th/id/*",
+]
+
+
+def enableLightweightMode(webdriver: WebDriver) -> bool:
+    """Block image, media and font requests through the DevTools protocol"""
+    try:
+        webdriver.execute_cdp_cmd("Network.enable", {})
+        webdriver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except (AttributeError, WebDriverException) as e:
+        logging.warning(f"[LIGHTWEIGHT] Resource blocking unavailable, using full page loads: {e}")
+        return False
+    logging.info("[LIGHTWEIGHT] Blocking images, media and fonts during searches")
+    return True
+
+
+def navigateEager(webdriver: WebDriver, url: str, timeToWait: float = 60) -> None:
+    """
+    Navigate without waiting for the load event, like the 'eager' page load strategy.
+    Returns once the previous document is gone, callers then wait for the element they need.
+    """
+    oldDocument = webdriver.find_element(By.TAG_NAME, "html")
+    webdriver.execute_cdp_cmd("Page.navigate", {"url": url})
+    WebDriverWait(webdriver, timeToWait).until(expected_conditions.staleness_of(oldDocument))
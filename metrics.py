@@ -0,0 +1,87 @@
+import contextlib
+import logging
+import threading
+from collections import Counter
+from time import monotonic
+from typing import Iterator
+
+NO_PHASE = "run"
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class RunMetrics:
+    """
+    Process-wide measurements of a run, grouped by phase (desktop, mobile, ...).
+    Values are kept per (phase, metric) so percentiles and peaks can be computed per phase.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.currentPhase = NO_PHASE
+        self.phaseSeconds: dict[str, float] = {}
+        self.counters: Counter = Counter()
+        self.values: dict[tuple[str, str], list[float]] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        previous, self.currentPhase = self.currentPhase, name
+        start = monotonic()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phaseSeconds[name] = self.phaseSeconds.get(name, 0.0) + monotonic() - start
+            self.currentPhase = previous
+            logging.debug(f"[METRICS] {name}: {self.phaseSummary(name)}")
+
+    def incr(self, name: str, count: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += count
+
+    def observe(self, name: str, value: float, phase: str | None = None) -> None:
+        with self.lock:
+            self.values.setdefault((phase or self.currentPhase, name), []).append(value)
+
+    @contextlib.contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, monotonic() - start)
+
+    def phaseSummary(self, phase: str) -> dict:
+        with self.lock:
+            series = {name: list(v) for (p, name), v in self.values.items() if p == phase}
+        return {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 0.5),
+                "p90": percentile(values, 0.9),
+                "p99": percentile(values, 0.99),
+                "peak": max(values),
+                "total": sum(values),
+            }
+            for name, values in series.items()
+        }
+
+    def summary(self) -> dict:
+        with self.lock:
+            phases = sorted({p for p, _ in self.values} | set(self.phaseSeconds))
+            counters = dict(self.counters)
+            phaseSeconds = dict(self.phaseSeconds)
+        return {
+            "counters": counters,
+            "phases": {
+                phase: {"seconds": phaseSeconds.get(phase, 0.0), "metrics": self.phaseSummary(phase)}
+                for phase in phases
+            },
+        }
+
+
+RUN_METRICS = RunMetrics()
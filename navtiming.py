@@ -0,0 +1,74 @@
+import logging
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.metrics import RUN_METRICS
+from src.utils import CONFIG
+
+NAVIGATION_TIMING_SCRIPT = """
+const navigation = performance.getEntriesByType("navigation")[0];
+if (!navigation) {
+    return null;
+}
+const resources = performance.getEntriesByType("resource");
+return {
+    origin: performance.timeOrigin,
+    entry: navigation.toJSON(),
+    resourceBytes: resources.reduce((total, resource) => total + (resource.transferSize || 0), 0),
+    resourceCount: resources.length,
+};
+"""
+
+
+def timingMetrics(entry: dict) -> dict[str, float]:
+    """
+    Split a PerformanceNavigationTiming entry (milliseconds) into seconds per stage, so network,
+    server and rendering time can be told apart. Stages the browser did not reach are left out.
+    """
+
+    def span(start: str, end: str) -> float | None:
+        if not entry.get(end) or entry.get(start) is None:
+            return None
+        return max(0.0, entry[end] - entry[start]) / 1000
+
+    metrics = {
+        "dns": span("domainLookupStart", "domainLookupEnd"),
+        "connect": span("connectStart", "connectEnd"),
+        "tls": span("secureConnectionStart", "connectEnd") if entry.get("secureConnectionStart") else None,
+        "server": span("requestStart", "responseStart"),
+        "ttfb": span("startTime", "responseStart"),
+        "download": span("responseStart", "responseEnd"),
+        "domContentLoaded": span("startTime", "domContentLoadedEventEnd"),
+        "load": span("startTime", "loadEventEnd"),
+    }
+    return {name: value for name, value in metrics.items() if value is not None}
+
+
+class NavigationTimings:
+    """
+    Read the browser's Navigation and Resource Timing entries after a page change and feed them to
+    RUN_METRICS as navigation.<page>.<stage>.seconds and navigation.<page>.transferBytes.
+    A document is only recorded once, identified by its time origin.
+    """
+
+    def __init__(self, enabled: bool | None = None):
+        self.enabled = enabled if enabled is not None else (CONFIG.get("metrics") or {}).get("navigation-timing", True)
+        self.lastOrigin: float | None = None
+
+    def record(self, webdriver: WebDriver, page: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            timing = webdriver.execute_script(NAVIGATION_TIMING_SCRIPT)
+        except (AttributeError, WebDriverException) as e:
+            logging.debug(f"[TIMING] Navigation timing unavailable: {e}")
+            return
+        if not timing or timing["origin"] == self.lastOrigin:
+            return
+        self.lastOrigin = timing["origin"]
+        for stage, seconds in timingMetrics(timing["entry"]).items():
+            RUN_METRICS.observe(f"navigation.{page}.{stage}.seconds", seconds)
+        transferBytes = (timing["entry"].get("transferSize") or 0) + timing["resourceBytes"]
+        RUN_METRICS.observe(f"navigation.{page}.transferBytes", transferBytes)
+        RUN_METRICS.observe(f"navigation.{page}.resources", timing["resourceCount"])
@@ -0,0 +1,204 @@
+import contextlib
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from time import monotonic
+from typing import Callable
+
+from apprise import Apprise
+
+from src import utils
+from src.metrics import RUN_METRICS
+from src.utils import CONFIG
+
+
+@dataclass
+class Notification:
+    title: str
+    body: str
+
+
+def appriseSend(url: str, title: str, body: str) -> bool:
+    apprise = Apprise()
+    apprise.add(url)
+    return apprise.notify(title=title, body=body)
+
+
+def coalesce(notifications: list[Notification]) -> Notification:
+    """Merge a burst of notifications into a single message"""
+    if len(notifications) == 1:
+        return notifications[0]
+    body = "\n\n".join(f"{n.title}\n{n.body}" for n in notifications)
+    return Notification(f"{len(notifications)} notifications", body)
+
+
+class NotificationDispatcher:
+    """
+    Send notifications from a background thread so a slow webhook never blocks a search.
+    Bursts arriving within coalesceWindow seconds are merged, each destination gets at most
+    one message every minInterval seconds and a send is abandoned after sendTimeout seconds.
+    What is still pending at close() is sent from the closing thread, no thread is started then.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        coalesceWindow: float = 5.0,
+        minInterval: float = 30.0,
+        sendTimeout: float = 10.0,
+        maxQueued: int = 100,
+        sender: Callable[[str, str, str], bool] = appriseSend,
+    ):
+        self.urls = list(urls)
+        self.coalesceWindow = coalesceWindow
+        self.minInterval = minInterval
+        self.sendTimeout = sendTimeout
+        self.sender = sender
+        self.queue: queue.Queue[Notification | None] = queue.Queue(maxQueued)
+        self.pending: dict[str, list[Notification]] = {url: [] for url in self.urls}
+        self.lastSent: dict[str, float] = {}
+        self.closing = threading.Event()
+        self.worker = threading.Thread(target=self._run, name="notifications", daemon=True)
+        self.worker.start()
+
+    def send(self, title: str, body: str) -> None:
+        """Queue a notification, never blocks"""
+        if self.closing.is_set():
+            logging.warning(f"[NOTIFY] Dispatcher closed, dropping '{title}'")
+            return
+        try:
+            self.queue.put_nowait(Notification(title, body))
+        except queue.Full:
+            RUN_METRICS.incr("notifications.dropped")
+            logging.warning(f"[NOTIFY] Queue full, dropping '{title}'")
+
+    def close(self, deadline: float = 10.0) -> None:
+        """Flush what is pending, giving up after deadline seconds"""
+        if self.closing.is_set():
+            return
+        self.closing.set()
+        # The worker stops on its own after its current send once closing is set, the marker only wakes it up
+        with contextlib.suppress(queue.Full):
+            self.queue.put_nowait(None)
+        self.worker.join(deadline)
+        if self.worker.is_alive():
+            logging.warning(f"[NOTIFY] Flush did not finish within {deadline}s, some notifications are lost")
+            return
+        with contextlib.suppress(queue.Empty):
+            first = self.queue.get_nowait()
+            if first is not None:
+                self._collect(first)
+        for url in self.urls:
+            self._deliver(url, force=True, inline=True)
+
+    def _collect(self, first: Notification) -> None:
+        """Gather everything that arrives within the coalescing window"""
+        burst = [first]
+        windowEnd = monotonic() + self.coalesceWindow
+        while True:
+            # When closing, drain what is already queued without waiting for more
+            timeout = 0.0 if self.closing.is_set() else max(0.0, windowEnd - monotonic())
+            try:
+                notification = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if notification is None:
+                break
+            burst.append(notification)
+        RUN_METRICS.incr("notifications.coalesced", len(burst) - 1)
+        for url in self.urls:
+            self.pending[url].extend(burst)
+
+    def _deliver(self, url: str, force: bool = False, inline: bool = False) -> None:
+        if not self.pending[url]:
+            return
+        if not force and monotonic() - self.lastSent.get(url, float("-inf")) < self.minInterval:
+            return
+        notification = coalesce(self.pending[url])
+        self.pending[url] = []
+        self.lastSent[url] = monotonic()
+        if inline:
+            # At interpreter shutdown no thread can be started, the send is bounded by apprise's own timeouts
+            sent = self.sender(url, notification.title, notification.body)
+            RUN_METRICS.incr("notifications.sent" if sent else "notifications.failed")
+            if not sent:
+                logging.warning(f"[NOTIFY] Sending '{notification.title}' failed")
+            return
+        result: list[bool] = []
+        sender = threading.Thread(
+            target=lambda: result.append(self.sender(url, notification.title, notification.body)),
+            name="notification-send",
+            daemon=True,
+        )
+        sender.start()
+        sender.join(self.sendTimeout)
+        if sender.is_alive():
+            RUN_METRICS.incr("notifications.timeouts")
+            logging.warning(f"[NOTIFY] Sending '{notification.title}' timed out after {self.sendTimeout}s")
+        elif result and result[0]:
+            RUN_METRICS.incr("notifications.sent")
+        else:
+            RUN_METRICS.incr("notifications.failed")
+            logging.warning(f"[NOTIFY] Sending '{notification.title}' failed")
+
+    def _run(self) -> None:
+        while True:
+            # Wake up in time for the rate-limited destinations that still have pending messages
+            waits = [
+                self.lastSent.get(url, 0) + self.minInterval - monotonic()
+                for url in self.urls
+                if self.pending[url]
+            ]
+            try:
+                notification = self.queue.get(timeout=max(0.0, min(waits)) if waits else None)
+            except queue.Empty:
+                notification = None
+            if notification is not None:
+                self._collect(notification)
+            # What is left is flushed by close()
+            if self.closing.is_set():
+                return
+            for url in self.urls:
+                self._deliver(url)
+
+
+_dispatcher: NotificationDispatcher | None = None
+_dispatcherLock = threading.Lock()
+
+
+def getNotificationDispatcher() -> NotificationDispatcher | None:
+    """Shared dispatcher built from the apprise config, None when apprise is disabled"""
+    global _dispatcher
+    appriseConfig = CONFIG.get("apprise") or {}
+    if not appriseConfig.get("enabled") or not appriseConfig.get("urls"):
+        return None
+    with _dispatcherLock:
+        if _dispatcher is None:
+            dispatchConfig = appriseConfig.get("dispatch") or {}
+            _dispatcher = NotificationDispatcher(
+                appriseConfig.get("urls"),
+                coalesceWindow=dispatchConfig.get("coalesce-window", 5),
+                minInterval=dispatchConfig.get("min-interval", 30),
+                sendTimeout=dispatchConfig.get("send-timeout", 10),
+            )
+            # apprise loads its plugins on first use, which fails at shutdown: load them now
+            Apprise().add(appriseConfig.get("urls"))
+            # Flushed before the interpreter stops the threads, an atexit callback could no longer send
+            threading._register_atexit(_dispatcher.close, dispatchConfig.get("shutdown-deadline", 10))
+        return _dispatcher
+
+
+def sendNotification(title: str, body: str, e: Exception | None = None) -> None:
+    """Asynchronous replacement for utils.sendNotification, with the same signature"""
+    if e is not None and not (CONFIG.get("apprise").get("notify") or {}).get("uncaught-exception", True):
+        return
+    dispatcher = getNotificationDispatcher()
+    if dispatcher:
+        dispatcher.send(title, body)
+
+
+
+def installNotificationDispatcher() -> None:
+    """Route the synchronous utils.sendNotification callers (main.py, login, ...) through the dispatcher"""
+    utils.sendNotification = sendNotification
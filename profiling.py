@@ -0,0 +1,194 @@
+import argparse
+import cProfile
+import functools
+import logging
+import pstats
+import runpy
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from src.utils import CONFIG, getProjectRoot
+
+PROFILES_DIR = "profiles"
+
+# A nested Profile() would disable the outer one: a thread runs one profile, recorded by the outermost call.
+# Before 3.12 each thread can run its own, from 3.12 one profile runs at a time (ValueError otherwise).
+_profiling = threading.local()
+_profileLock = threading.Lock()
+CONCURRENT_PROFILES = sys.version_info < (3, 12)
+
+
+def _settings() -> dict:
+    return CONFIG.get("profiling") or {}
+
+
+def _outputPath(name: str, suffix: str) -> Path:
+    folder = getProjectRoot() / PROFILES_DIR
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder / f"{name}-{datetime.now():%Y%m%d-%H%M%S}{suffix}"
+
+
+def writeCollapsedStacks(stats: pstats.Stats, path: Path, maxDepth: int = 64) -> None:
+    """
+    Write cProfile data in the collapsed-stack format read by flamegraph.pl and speedscope.
+    cProfile only keeps caller/callee pairs, so each function's own time is split across
+    its callers in proportion to the cumulative time of each call edge.
+    """
+    entries = stats.stats  # func -> (cc, nc, tt, ct, callers)
+    children: dict[tuple, list[tuple]] = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            children.setdefault(caller, []).append(func)
+
+    def label(func: tuple) -> str:
+        filename, line, name = func
+        return f"{name} ({Path(filename).name}:{line})".replace(";", ":")
+
+    lines: dict[str, int] = {}
+
+    def walk(func: tuple, stack: list[str], share: float, seen: set) -> None:
+        _, _, tt, ct, _ = entries[func]
+        stack = stack + [label(func)]
+        selfTime = int(tt * share * 1_000_000)
+        if selfTime:
+            key = ";".join(stack)
+            lines[key] = lines.get(key, 0) + selfTime
+        if len(stack) >= maxDepth:
+            return
+        for child in children.get(func, ()):
+            if child in seen:
+                continue
+            childCt = entries[child][3]
+            edgeCt = entries[child][4][func][3]
+            # Paths worth less than a microsecond are dropped to keep the walk bounded
+            if childCt and share * edgeCt >= 1e-6:
+                walk(child, stack, share * edgeCt / childCt, seen | {child})
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(func, [], 1.0, {func})
+
+    with open(path, "w", encoding="utf-8") as file:
+        for stack, micros in lines.items():
+            file.write(f"{stack} {micros}\n")
+
+
+class _TracemallocSampler(threading.Thread):
+    """Log the top allocation differences between consecutive snapshots"""
+
+    def __init__(self, name: str, interval: float, top: int):
+        super().__init__(name=f"tracemalloc-{name}", daemon=True)
+        self.label = name
+        self.interval = interval
+        self.top = top
+        self.stopped = threading.Event()
+        self.previous: tracemalloc.Snapshot | None = None
+        self.path = _outputPath(name, ".tracemalloc.txt")
+
+    def snapshot(self) -> None:
+        current = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        size, peak = tracemalloc.get_traced_memory()
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(f"== {datetime.now():%H:%M:%S} current={size} peak={peak}\n")
+            if self.previous is not None:
+                for stat in current.compare_to(self.previous, "lineno")[: self.top]:
+                    file.write(f"{stat}\n")
+                    logging.debug(f"[PROFILING] {self.label}: {stat}")
+        self.previous = current
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.snapshot()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+        self.snapshot()
+
+
+def profiled(name: str) -> Callable:
+    """
+    Profile the decorated function according to the 'profiling' config section.
+    When profiling is disabled the function is returned as is, so it costs nothing.
+    A call made while another profiled call is running is recorded by the outer profile only.
+    """
+    settings = _settings()
+    useCProfile = settings.get("cprofile", False)
+    useTracemalloc = settings.get("tracemalloc", False)
+
+    def decorator(function: Callable) -> Callable:
+        if not (useCProfile or useTracemalloc):
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            sampler = None
+            if useTracemalloc:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(settings.get("tracemalloc-frames", 5))
+                sampler = _TracemallocSampler(
+                    name,
+                    settings.get("tracemalloc-interval", 300),
+                    settings.get("tracemalloc-top", 10),
+                )
+                sampler.snapshot()
+                sampler.start()
+            profile = None
+            locked = False
+            if useCProfile and getattr(_profiling, "active", False):
+                logging.debug(f"[PROFILING] {name}: already inside a profile, recorded by the outer one")
+            elif useCProfile and (CONCURRENT_PROFILES or _profileLock.acquire(blocking=False)):
+                locked = not CONCURRENT_PROFILES
+                _profiling.active = True
+                profile = cProfile.Profile()
+            elif useCProfile:
+                logging.debug(f"[PROFILING] {name}: another thread is being profiled, not profiled")
+            try:
+                if profile:
+                    return profile.runcall(function, *args, **kwargs)
+                return function(*args, **kwargs)
+            finally:
+                if profile:
+                    _profiling.active = False
+                    if locked:
+                        _profileLock.release()
+                    stats = pstats.Stats(profile)
+                    statsPath = _outputPath(name, ".pstats")
+                    stats.dump_stats(statsPath)
+                    writeCollapsedStacks(stats, statsPath.with_suffix(".collapsed"))
+                    logging.info(f"[PROFILING] {name}: cProfile data written to {statsPath}")
+                if sampler:
+                    sampler.stop()
+                    logging.info(f"[PROFILING] {name}: tracemalloc diffs written to {sampler.path}")
+
+        return wrapper
+
+    return decorator
+
+
+if __name__ == "__main__":
+    # Run a script with profiling enabled without editing config.yaml:
+    # python -m src.profiling --cprofile --tracemalloc main.py -c config.yaml
+    parser = argparse.ArgumentParser(description="Run a script with profiling hooks enabled")
+    parser.add_argument("--cprofile", action="store_true", help="Dump pstats and collapsed stacks")
+    parser.add_argument("--tracemalloc", action="store_true", help="Log periodic tracemalloc diffs")
+    parser.add_argument("--interval", type=float, help="Seconds between tracemalloc snapshots")
+    parser.add_argument("script", help="Script to run, usually main.py")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments of the script")
+    arguments = parser.parse_args()
+
+    settings = dict(_settings())
+    CONFIG["profiling"] = settings
+    settings["cprofile"] = settings.get("cprofile", False) or arguments.cprofile
+    settings["tracemalloc"] = settings.get("tracemalloc", False) or arguments.tracemalloc
+    if arguments.interval:
+        settings["tracemalloc-interval"] = arguments.interval
+
+    sys.argv = [arguments.script, *arguments.args]
+    runpy.run_path(arguments.script, run_name="__main__")
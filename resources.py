@@ -0,0 +1,132 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from time import monotonic
+
+from src.browser import Browser
+from src.metrics import RUN_METRICS
+from src.utils import CONFIG
+
+PROC = Path("/proc")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def readCpuTicks(pid: int) -> int:
+    """utime + stime of a process, in clock ticks"""
+    stat = (PROC / str(pid) / "stat").read_text()
+    # The command name may contain spaces, the fields start after its closing parenthesis
+    fields = stat[stat.rindex(")") + 2:].split()
+    return int(fields[11]) + int(fields[12])
+
+
+def readRssBytes(pid: int) -> int:
+    return int((PROC / str(pid) / "statm").read_text().split()[1]) * PAGE_SIZE
+
+
+def childrenByParent() -> dict[int, list[int]]:
+    children: dict[int, list[int]] = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        parent = int(stat[stat.rindex(")") + 2:].split()[1])
+        children.setdefault(parent, []).append(int(entry.name))
+    return children
+
+
+def descendants(pid: int, children: dict[int, list[int]] | None = None) -> list[int]:
+    children = children if children is not None else childrenByParent()
+    found, pending = [], list(children.get(pid, []))
+    while pending:
+        child = pending.pop()
+        found.append(child)
+        pending.extend(children.get(child, []))
+    return found
+
+
+def driverPid(browser: Browser) -> int | None:
+    service = getattr(browser.webdriver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+
+def browserPids(browser: Browser) -> list[int]:
+    """
+    The browser process tree. undetected_chromedriver starts Chrome detached from chromedriver,
+    so its browser_pid is followed as well as the driver's children.
+    """
+    children = childrenByParent()
+    root, detached = driverPid(browser), getattr(browser.webdriver, "browser_pid", None)
+    pids = descendants(root, children) if root is not None else []
+    if detached is not None and detached not in pids:
+        pids += [detached, *(pid for pid in descendants(detached, children) if pid not in pids)]
+    return pids
+
+
+class BrowserResourceSampler(threading.Thread):
+    """
+    Sample CPU% and RSS of the WebDriver and of the browser process tree,
+    from /proc, while a search phase runs. Samples go to RUN_METRICS under the current phase.
+    """
+
+    def __init__(self, browser: Browser, interval: float | None = None):
+        super().__init__(name="browser-resources", daemon=True)
+        self.browser = browser
+        self.interval = interval if interval is not None else (
+            (CONFIG.get("metrics") or {}).get("resource-interval", 2)
+        )
+        self.phase = RUN_METRICS.currentPhase
+        self.stopped = threading.Event()
+        self.lastTicks: dict[int, int] = {}
+        self.lastTime = monotonic()
+
+    def sample(self) -> None:
+        root = driverPid(self.browser)
+        if root is None:
+            return
+        now = monotonic()
+        elapsed = now - self.lastTime
+        self.lastTime = now
+        groups = {"driver": [root], "browser": browserPids(self.browser)}
+        ticks: dict[int, int] = {}
+        for group, pids in groups.items():
+            cpuTicks = rss = 0
+            for pid in pids:
+                try:
+                    ticks[pid] = readCpuTicks(pid)
+                    rss += readRssBytes(pid)
+                except (OSError, ValueError):
+                    # The process exited between the listing and the read
+                    continue
+                cpuTicks += ticks[pid] - self.lastTicks.get(pid, ticks[pid])
+            RUN_METRICS.observe(f"{group}.rssBytes", rss, self.phase)
+            if self.lastTicks and elapsed > 0:
+                cpuPercent = 100.0 * cpuTicks / CLOCK_TICKS / elapsed
+                RUN_METRICS.observe(f"{group}.cpuPercent", cpuPercent, self.phase)
+        RUN_METRICS.observe("browser.processes", len(groups["browser"]), self.phase)
+        self.lastTicks = ticks
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logging.debug(f"[RESOURCES] Sampling failed: {e}")
+
+    def __enter__(self):
+        if self.interval and PROC.is_dir():
+            self.sample()
+            self.start()
+        else:
+            logging.debug("[RESOURCES] Browser resource sampling disabled")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.is_alive():
+            self.stopped.set()
+            self.join()
@@ -0,0 +1,168 @@
+import logging
+import threading
+from dataclasses import dataclass
+from enum import Enum, auto
+from random import uniform
+from time import monotonic
+from typing import Callable, TypeVar
+
+from src.configwatch import onConfigApplied
+from src.deadline import Deadline, DeadlineExceeded
+from src.metrics import RUN_METRICS
+from src.shutdown import pause
+from src.utils import CONFIG
+
+T = TypeVar("T")
+
+
+class RetriesStrategy(Enum):
+    """
+    method to use when retrying
+    """
+
+    EXPONENTIAL = auto()
+    """
+    an exponentially increasing `backoff-factor` between attempts
+    """
+    CONSTANT = auto()
+    """
+    the default; a constant `backoff-factor` between attempts
+    """
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+
+@dataclass
+class RetryPolicy:
+    maxRetries: int
+    baseDelay: float
+    strategy: RetriesStrategy
+
+    @classmethod
+    def fromConfig(cls) -> "RetryPolicy":
+        retriesConfig = CONFIG.get("retries")
+        return cls(
+            maxRetries=retriesConfig.get("max"),
+            # 'base_delay_in_seconds' is the old name of 'backoff-factor'
+            baseDelay=retriesConfig.get("backoff-factor", retriesConfig.get("base_delay_in_seconds")),
+            strategy=RetriesStrategy[retriesConfig.get("strategy")],
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Full jitter: a random wait between 0 and the strategy's delay for this attempt"""
+        ceiling = self.baseDelay
+        if self.strategy == RetriesStrategy.EXPONENTIAL:
+            ceiling *= 2**attempt
+        return uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Stop calling an endpoint after failureThreshold consecutive failures, for coolOff seconds.
+    After the cool-off a single trial call is let through; it closes the circuit on success.
+    """
+
+    def __init__(self, name: str, failureThreshold: int = 3, coolOff: float = 600):
+        self.name = name
+        self.failureThreshold = failureThreshold
+        self.coolOff = coolOff
+        self.failures = 0
+        self.openedAt: float | None = None
+        self.lock = threading.Lock()
+
+    @property
+    def isOpen(self) -> bool:
+        return self.openedAt is not None and monotonic() - self.openedAt < self.coolOff
+
+    def allow(self) -> bool:
+        return not self.isOpen
+
+    def recordSuccess(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.openedAt = None
+
+    def recordFailure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            # A failed trial call after the cool-off reopens the circuit straight away
+            if self.failures >= self.failureThreshold or self.openedAt is not None:
+                self.openedAt = monotonic()
+                RUN_METRICS.incr(f"breaker.{self.name}.opened")
+                logging.warning(f"[RETRY] Circuit for {self.name} open for {self.coolOff}s")
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakersLock = threading.Lock()
+
+
+def getCircuitBreaker(endpoint: str) -> CircuitBreaker:
+    """Breakers are shared by every Searches instance of the process"""
+    with _breakersLock:
+        if endpoint not in _breakers:
+            breakerConfig = CONFIG.get("retries").get("circuit-breaker") or {}
+            _breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failureThreshold=breakerConfig.get("failure-threshold", 3),
+                coolOff=breakerConfig.get("cool-off", 600),
+            )
+        return _breakers[endpoint]
+
+
+@onConfigApplied
+def reconfigureBreakers() -> None:
+    """Apply a reloaded 'retries.circuit-breaker' to the existing breakers"""
+    breakerConfig = CONFIG.get("retries").get("circuit-breaker") or {}
+    with _breakersLock:
+        for breaker in _breakers.values():
+            breaker.failureThreshold = breakerConfig.get("failure-threshold", 3)
+            breaker.coolOff = breakerConfig.get("cool-off", 600)
+
+
+def retry(
+    endpoint: str,
+    function: Callable[[], T],
+    policy: RetryPolicy,
+    retryOn: tuple[type[BaseException], ...] = (Exception,),
+    wait: Callable[[float], object] = pause,
+    deadline: Deadline | None = None,
+    useBreaker: bool = True,
+) -> T:
+    """
+    Call function, retrying on retryOn exceptions according to policy.
+    Raises CircuitOpenError without calling it while the endpoint's breaker is open,
+    and gives up early when the next wait would not fit in the deadline.
+    Breakers are for remote endpoints; local waits (e.g. the search box) pass useBreaker=False.
+    """
+    breaker = getCircuitBreaker(endpoint) if useBreaker else None
+    for attempt in range(policy.maxRetries + 1):
+        if breaker and not breaker.allow():
+            RUN_METRICS.incr(f"breaker.{endpoint}.rejected")
+            raise CircuitOpenError(f"Circuit for {endpoint} is open")
+        RUN_METRICS.incr(f"retries.{endpoint}.attempts")
+        try:
+            result = function()
+        except DeadlineExceeded:
+            raise
+        except retryOn as e:
+            if breaker:
+                breaker.recordFailure()
+            RUN_METRICS.incr(f"retries.{endpoint}.failures")
+            if attempt == policy.maxRetries or (breaker and not breaker.allow()):
+                raise
+            delay = policy.delay(attempt)
+            if deadline and deadline.remaining() <= delay:
+                deadline.overrun(endpoint)
+                raise
+            RUN_METRICS.incr(f"retries.{endpoint}.retries")
+            logging.warning(
+                f"[RETRY] {endpoint} failed ({e}), attempt {attempt + 1}/{policy.maxRetries + 1}, "
+                f"retrying in {delay:.1f}s"
+            )
+            wait(delay)
+        else:
+            if breaker:
+                breaker.recordSuccess()
+            return result
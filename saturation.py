@@ -0,0 +1,47 @@
+import logging
+from collections import deque
+
+from src.metrics import RUN_METRICS
+from src.utils import CONFIG
+
+
+class SaturationDetector:
+    """
+    Tell when searches stop being credited: over the last `window` submitted searches the
+    account's remaining-searches counter has not gone down, e.g. because the daily cap was hit
+    earlier than the custom limits assume. A window of 0 disables it.
+    """
+
+    def __init__(self, window: int | None = None):
+        self.window = window if window is not None else (CONFIG.get("search") or {}).get("saturation-window", 6)
+        # (searches submitted so far, remaining searches read at that point)
+        self.samples: deque[tuple[int, int]] = deque()
+        self.reason: str | None = None
+
+    def record(self, submitted: int, remaining: int | None) -> None:
+        if remaining is None:
+            return
+        self.samples.append((submitted, remaining))
+        # Keep the most recent sample that is at least a window behind the latest one
+        while len(self.samples) > 1 and submitted - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+
+    @property
+    def credited(self) -> bool:
+        """The counter reached 0: every search of the day is credited, which is not a stall"""
+        return bool(self.samples) and self.samples[-1][1] <= 0
+
+    def saturated(self) -> bool:
+        if not self.window or len(self.samples) < 2 or self.credited:
+            return False
+        (firstSubmitted, firstRemaining), (lastSubmitted, lastRemaining) = self.samples[0], self.samples[-1]
+        if lastSubmitted - firstSubmitted < self.window or lastRemaining < firstRemaining:
+            return False
+        if self.reason is None:
+            self.reason = (
+                f"{lastSubmitted - firstSubmitted} searches submitted without credit, "
+                f"remaining searches stuck at {lastRemaining}"
+            )
+            RUN_METRICS.incr("searches.saturated")
+            logging.warning(f"[SATURATION] {self.reason}")
+        return True
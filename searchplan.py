@@ -0,0 +1,160 @@
+import dbm.dumb
+import json
+import logging
+import shelve
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from time import monotonic
+from typing import Callable, Iterable, Iterator
+
+from src.shutdown import checkShutdown
+
+SEARCH_PLAN_KEY = "searchPlan"
+
+
+def planKey(device: str) -> str:
+    """Shelf key of the plan for the given device"""
+    return f"{SEARCH_PLAN_KEY}-{device}"
+
+
+@dataclass
+class SearchStep:
+    """One search cycle: a primary keyword followed by its related terms"""
+    primaryKeyword: str
+    relatedTerms: list[str]
+    device: str
+
+    def searchCount(self) -> int:
+        return 1 + len(self.relatedTerms)
+
+
+@dataclass
+class SearchPlan:
+    """The whole day's searches for one device, with a cursor on the next step"""
+    device: str
+    planDate: date
+    steps: list[SearchStep] = field(default_factory=list)
+    cursor: int = 0
+
+    @property
+    def remainingSteps(self) -> int:
+        return len(self.steps) - self.cursor
+
+    def isDone(self) -> bool:
+        return self.cursor >= len(self.steps)
+
+    def isFor(self, device: str, day: date) -> bool:
+        return self.device == device and self.planDate == day
+
+    def toDict(self) -> dict:
+        data = asdict(self)
+        data["planDate"] = self.planDate.isoformat()
+        return data
+
+    @classmethod
+    def fromDict(cls, data: dict) -> "SearchPlan":
+        return cls(
+            device=data["device"],
+            planDate=date.fromisoformat(data["planDate"]),
+            steps=[SearchStep(**step) for step in data["steps"]],
+            cursor=data.get("cursor", 0),
+        )
+
+    def save(self, shelf: shelve.Shelf) -> None:
+        shelf[planKey(self.device)] = self.toDict()
+
+    @classmethod
+    def load(cls, shelf: shelve.Shelf, device: str) -> "SearchPlan | None":
+        data = shelf.get(planKey(device))
+        return cls.fromDict(data) if data else None
+
+    def dumps(self) -> str:
+        return json.dumps(self.toDict(), indent=2, ensure_ascii=False)
+
+
+def buildSearchPlan(
+    device: str,
+    stepsCount: int,
+    keywords: Iterable[str],
+    relatedTermsFor: Callable[[str], list[str]],
+    relatedTermsCount: int,
+) -> SearchPlan:
+    """
+    Build a plan of at most stepsCount steps from the given keywords.
+    Related terms are fetched once here so the search loop only has to read them.
+    """
+    plan = SearchPlan(device=device, planDate=date.today())
+    for keyword in keywords:
+        if len(plan.steps) >= stepsCount:
+            break
+        # Built in the background warm-up too, which must stop promptly on SIGTERM/SIGINT
+        checkShutdown()
+        relatedTerms = relatedTermsFor(keyword)[:relatedTermsCount]
+        plan.steps.append(SearchStep(keyword, relatedTerms, device))
+    if len(plan.steps) < stepsCount:
+        logging.warning(
+            f"[PLAN] Only {len(plan.steps)}/{stepsCount} steps planned, not enough keywords"
+        )
+    logging.debug(f"[PLAN] Built {device} plan: {[s.primaryKeyword for s in plan.steps]}")
+    return plan
+
+
+class SearchScheduler:
+    """
+    Walk a plan step by step, advancing its cursor once a step has been executed.
+    stop() ends the walk after the current step, which is still advanced and saved.
+    The ETA uses the measured step durations, or estimatedStepSeconds until one step is done.
+    """
+
+    def __init__(
+        self,
+        plan: SearchPlan,
+        estimatedStepSeconds: float,
+        onAdvance: Callable[[SearchPlan], None] | None = None,
+    ):
+        self.plan = plan
+        self.estimatedStepSeconds = estimatedStepSeconds
+        self.onAdvance = onAdvance
+        self._doneSteps = 0
+        self._doneSeconds = 0.0
+        self._stopped = False
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    def __iter__(self) -> Iterator[SearchStep]:
+        while not self.plan.isDone() and not self._stopped:
+            start = monotonic()
+            yield self.plan.steps[self.plan.cursor]
+            self._doneSeconds += monotonic() - start
+            self._doneSteps += 1
+            self.plan.cursor += 1
+            if self.onAdvance:
+                self.onAdvance(self.plan)
+
+    @property
+    def progress(self) -> float:
+        """Percentage of the plan's steps already executed"""
+        if not self.plan.steps:
+            return 100.0
+        return 100.0 * self.plan.cursor / len(self.plan.steps)
+
+    @property
+    def eta(self) -> float:
+        """Estimated seconds until the plan is done"""
+        stepSeconds = (
+            self._doneSeconds / self._doneSteps
+            if self._doneSteps
+            else self.estimatedStepSeconds
+        )
+        return stepSeconds * self.plan.remainingSteps
+
+
+if __name__ == "__main__":
+    # Inspect the persisted plans offline: python -m src.searchplan path/to/used_keywords
+    with shelve.Shelf(dbm.dumb.open(sys.argv[1], "r")) as shelf:
+        for device in ("desktop", "mobile"):
+            plan = SearchPlan.load(shelf, device)
+            if plan:
+                print(plan.dumps())
@@ -0,0 +1,152 @@
+import argparse
+import logging
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import monotonic
+
+from src.headless import headlessArguments
+from src.utils import CONFIG, getProjectRoot
+
+SESSIONS_DIR = "sessions"
+MB = 1024 * 1024
+BROWSER_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+
+# Never needed by a later launch: crash dumps, metrics and GPU/shader caches rebuilt on demand
+ALWAYS_PRUNED = [
+    "Crashpad", "BrowserMetrics", "GrShaderCache", "ShaderCache", "GraphiteDawnCache",
+    "GPUCache", "DawnCache", "DawnGraphiteCache", "DawnWebGPUCache", "component_crx_cache",
+]
+# Caches that speed up page loads, only pruned when the profile is over its size budget.
+# Cookies, Local Storage, IndexedDB, Session Storage and Preferences are never touched.
+PRUNED_OVER_BUDGET = [
+    "Cache", "Code Cache", "Media Cache", "Application Cache", "blob_storage",
+    "Service Worker/CacheStorage", "Service Worker/ScriptCache", "optimization_guide_model_store",
+]
+
+
+@dataclass
+class PruneReport:
+    path: Path
+    sizeBefore: int = 0
+    sizeAfter: int = 0
+    pruned: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+    launchSeconds: float | None = None
+
+    def __str__(self) -> str:
+        launch = f", browser launch {self.launchSeconds:.1f}s" if self.launchSeconds is not None else ""
+        return (
+            f"{self.path}: {self.sizeBefore / MB:.1f}MB -> {self.sizeAfter / MB:.1f}MB, "
+            f"{len(self.pruned)} folders pruned in {self.seconds:.1f}s{launch}"
+        )
+
+
+def directorySize(path: Path) -> int:
+    size = 0
+    for file in path.rglob("*"):
+        try:
+            if file.is_file() and not file.is_symlink():
+                size += file.stat().st_size
+        except OSError:
+            continue
+    return size
+
+
+def userDataDirs(sessions: Path) -> list[Path]:
+    """Browser user data directories under sessions, recognised by their 'Local State' file"""
+    return sorted(localState.parent for localState in sessions.rglob("Local State"))
+
+
+def profileDirs(userDataDir: Path) -> list[Path]:
+    """The user data directory itself and its profiles (Default, Profile 1, ...)"""
+    return [userDataDir, *sorted(p.parent for p in userDataDir.glob("*/Preferences"))]
+
+
+def pruneUserDataDir(userDataDir: Path, budget: int) -> PruneReport:
+    start = monotonic()
+    report = PruneReport(userDataDir, sizeBefore=directorySize(userDataDir))
+    size = report.sizeBefore
+
+    def prune(folder: Path) -> None:
+        nonlocal size
+        folderSize = directorySize(folder)
+        shutil.rmtree(folder, ignore_errors=True)
+        report.pruned[str(folder.relative_to(userDataDir))] = folderSize
+        size -= folderSize
+
+    for profile in profileDirs(userDataDir):
+        for name in ALWAYS_PRUNED:
+            if (profile / name).is_dir():
+                prune(profile / name)
+    if size > budget:
+        # Largest caches first, until the budget is met
+        candidates = [
+            profile / name
+            for profile in profileDirs(userDataDir)
+            for name in PRUNED_OVER_BUDGET
+            if (profile / name).is_dir()
+        ]
+        for folder in sorted(candidates, key=directorySize, reverse=True):
+            if size <= budget:
+                break
+            prune(folder)
+    report.sizeAfter = directorySize(userDataDir)
+    report.seconds = monotonic() - start
+    if report.sizeAfter > budget:
+        logging.warning(
+            f"[SESSIONS] {userDataDir} is still {report.sizeAfter / MB:.1f}MB after pruning, "
+            f"over its {budget / MB:.0f}MB budget"
+        )
+    return report
+
+
+def timeLaunch(userDataDir: Path, timeout: float = 60) -> float | None:
+    """Seconds a headless browser takes to start on the profile and load a blank page, None without a browser"""
+    binary = next(filter(None, map(shutil.which, BROWSER_BINARIES)), None)
+    if binary is None:
+        logging.warning("[SESSIONS] No browser found to time the launch")
+        return None
+    command = [binary, *headlessArguments(), "--no-sandbox", f"--user-data-dir={userDataDir}", "--dump-dom", "about:blank"]
+    start = monotonic()
+    try:
+        subprocess.run(command, capture_output=True, timeout=timeout, check=True)
+    except (OSError, subprocess.SubprocessError) as e:
+        logging.warning(f"[SESSIONS] Cannot time the browser launch on {userDataDir}: {e}")
+        return None
+    return monotonic() - start
+
+
+def pruneSessions(
+    sessions: Path | None = None, budget: int | None = None, timeLaunches: bool = False
+) -> list[PruneReport]:
+    """Prune every browser profile of the sessions folder, see the 'sessions' config section"""
+    sessions = sessions or getProjectRoot() / SESSIONS_DIR
+    if budget is None:
+        budget = int((CONFIG.get("sessions") or {}).get("budget", 300) * MB)
+    reports = [pruneUserDataDir(userDataDir, budget) for userDataDir in userDataDirs(sessions)]
+    for report in reports:
+        if timeLaunches:
+            # Launch time of the pruned profile, what the browser launch that follows pays
+            report.launchSeconds = timeLaunch(report.path)
+        logging.info(f"[SESSIONS] {report}")
+    return reports
+
+
+if __name__ == "__main__":
+    # Run by the launchers before the browser launch and after the run:
+    # python -m src.sessions /app/sessions --budget 300 --time-launch
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Prune the caches of the browser profiles")
+    parser.add_argument("sessions", type=Path, nargs="?", help="Sessions folder, 'sessions' by default")
+    parser.add_argument("--budget", type=float, help="Size budget in MB of each user data directory")
+    parser.add_argument("--time-launch", action="store_true", help="Time a headless browser launch on each profile")
+    arguments = parser.parse_args()
+    pruneReports = pruneSessions(
+        arguments.sessions,
+        int(arguments.budget * MB) if arguments.budget is not None else None,
+        timeLaunches=arguments.time_launch,
+    )
+    total = sum(report.sizeAfter for report in pruneReports)
+    print(f"[SESSIONS] {len(pruneReports)} profiles, {total / MB:.1f}MB in total")
@@ -0,0 +1,75 @@
+import logging
+import os
+import signal
+import threading
+from random import randint
+
+from src.metrics import RUN_METRICS
+from src.utils import CONFIG
+
+SHUTDOWN_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+shutdownRequested = threading.Event()
+_receivedSignal = signal.SIGTERM
+_installed = False
+
+
+class ShutdownRequested(SystemExit):
+    """
+    Raised at the next wait once SIGTERM or SIGINT was received. It is a SystemExit so that
+    `except Exception` blocks let it through and the context managers on the way flush their state.
+    """
+
+
+def _exitCode(signum: int) -> int:
+    return 128 + signum
+
+
+def _onSignal(signum: int, frame) -> None:
+    global _receivedSignal
+    name = signal.Signals(signum).name
+    if shutdownRequested.is_set():
+        logging.warning(f"[SHUTDOWN] Second {name}, exiting immediately")
+        os._exit(_exitCode(signum))
+    logging.warning(f"[SHUTDOWN] {name} received, stopping at the next wait and saving progress")
+    _receivedSignal = signum
+    shutdownRequested.set()
+    # Whatever is still running past the deadline is abandoned
+    deadline = (CONFIG.get("shutdown") or {}).get("deadline", 20)
+    timer = threading.Timer(deadline, _forceExit, (signum, deadline))
+    timer.daemon = True
+    timer.start()
+
+
+def _forceExit(signum: int, deadline: float) -> None:
+    logging.error(f"[SHUTDOWN] State not flushed within {deadline}s, exiting anyway")
+    os._exit(_exitCode(signum))
+
+
+def installSignalHandlers() -> None:
+    """Turn SIGTERM/SIGINT into a ShutdownRequested at the next wait; only possible from the main thread"""
+    global _installed
+    if _installed or threading.current_thread() is not threading.main_thread():
+        return
+    for signum in SHUTDOWN_SIGNALS:
+        signal.signal(signum, _onSignal)
+    _installed = True
+
+
+def checkShutdown() -> None:
+    if shutdownRequested.is_set():
+        raise ShutdownRequested(_exitCode(_receivedSignal))
+
+
+def pause(seconds: float) -> None:
+    """sleep() that returns early and raises ShutdownRequested when a shutdown is requested"""
+    checkShutdown()
+    shutdownRequested.wait(seconds)
+    checkShutdown()
+
+
+def cooldown() -> None:
+    """Random wait between the configured 'cooldown' bounds, interrupted by a shutdown"""
+    cooldownConfig = CONFIG.get("cooldown")
+    with RUN_METRICS.timer("cooldown.seconds"):
+        pause(randint(cooldownConfig.get("min"), cooldownConfig.get("max")))
@@ -0,0 +1,117 @@
+import json
+import logging
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.metrics import RUN_METRICS
+from src.utils import CONFIG
+
+STATUS_HOST = "127.0.0.1"  # Loopback only, the status is never exposed outside the machine
+
+
+def cacheHitRates(counters: dict[str, int]) -> dict[str, float]:
+    """Hit rate of each cache counting '<name>.cache-hits' against '<name>.requests'"""
+    rates = {}
+    for name, hits in counters.items():
+        if name.endswith(".cache-hits"):
+            prefix = name.removesuffix(".cache-hits")
+            lookups = hits + counters.get(f"{prefix}.requests", 0)
+            rates[prefix] = hits / lookups if lookups else 0.0
+    return rates
+
+
+class StatusBoard:
+    """
+    In-memory status of the run, published by the search thread at step boundaries and served
+    as JSON by a loopback HTTP server thread. Serving a request never touches the shelves or the
+    browser: it only reads what was published and RUN_METRICS.
+    """
+
+    def __init__(self, port: int = 0):
+        self.lock = threading.Lock()
+        self.published: dict[str, dict] = {}
+        self.updatedAt: str | None = None
+        self.server = ThreadingHTTPServer((STATUS_HOST, port), self._handlerClass())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="status", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/status"
+
+    def start(self) -> "StatusBoard":
+        self.thread.start()
+        logging.info(f"[STATUS] Run status served at {self.url}")
+        return self
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def publish(self, section: str, **fields) -> None:
+        with self.lock:
+            self.published.setdefault(section, {}).update(fields)
+            self.updatedAt = datetime.now().isoformat(timespec="seconds")
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            published = json.loads(json.dumps(self.published, default=str))
+            updatedAt = self.updatedAt
+        phase = RUN_METRICS.currentPhase
+        counters = dict(RUN_METRICS.counters)
+        return {
+            "updated": updatedAt,
+            "phase": phase,
+            **published,
+            "counters": counters,
+            "cacheHitRates": cacheHitRates(counters),
+            "latency": {
+                name: stats
+                for name, stats in RUN_METRICS.phaseSummary(phase).items()
+                if name.endswith(".seconds")
+            },
+        }
+
+    def _handlerClass(self) -> type:
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/status"):
+                    self.send_error(404)
+                    return
+                payload = json.dumps(board.snapshot(), indent=1).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+_board: StatusBoard | None = None
+_boardFailed = False
+_boardLock = threading.Lock()
+
+
+def getStatusBoard() -> StatusBoard | None:
+    """Board of the process, started on first use; None when 'status.enabled' is off"""
+    global _board, _boardFailed
+    statusConfig = CONFIG.get("status") or {}
+    if not statusConfig.get("enabled", False) or _boardFailed:
+        return None
+    with _boardLock:
+        if _board is None:
+            try:
+                _board = StatusBoard(statusConfig.get("port", 8765)).start()
+            except OSError as e:
+                logging.warning(f"[STATUS] Cannot serve the run status: {e}")
+                _boardFailed = True
+                return None
+        return _board
@@ -0,0 +1,98 @@
+import dbm.dumb
+import json
+import logging
+import os
+import re
+import shelve
+from datetime import date
+from pathlib import Path
+
+from src.cassettes import getCassette
+from src.utils import CONFIG, getProjectRoot
+
+STORES_DIR = "stores"
+TRENDS_STORE = "google_trends"
+USED_KEYWORDS_STORE = "used_keywords"
+TRENDS_SNAPSHOT = "trends-snapshot.json"
+DUMB_DBM_SUFFIXES = (".dat", ".dir", ".bak")
+
+
+def accountNamespace(email: str | None) -> str:
+    """Directory name of an account's stores, 'default' when the browser has no account"""
+    if not email:
+        return "default"
+    return re.sub(r"[^a-z0-9@._-]", "_", email.lower())
+
+
+def storePaths(email: str | None, device: str) -> tuple[Path, Path]:
+    """
+    (trends pool, used keywords) of an account and device. The used keywords, plans and custom-mode
+    progress are shared by the account's devices so desktop and mobile never repeat a keyword;
+    the trends pool is per device. With 'stores.per-account' off, every account shares the legacy files.
+    """
+    root = getProjectRoot()
+    if not (CONFIG.get("stores") or {}).get("per-account", True):
+        return root / TRENDS_STORE, root / USED_KEYWORDS_STORE
+    accountDir = root / STORES_DIR / accountNamespace(email)
+    return accountDir / device / TRENDS_STORE, accountDir / USED_KEYWORDS_STORE
+
+
+def openStore(path: Path, fresh: bool = False) -> shelve.Shelf:
+    """
+    Open a dbm.dumb shelf, creating its directory. dbm.dumb never reclaims the space of deleted
+    keys, so a fresh store is recreated empty rather than cleared key by key.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return shelve.Shelf(dbm.dumb.open(str(path), "n" if fresh else "c"))
+
+
+def recreateStore(shelf: shelve.Shelf, path: Path) -> shelve.Shelf:
+    """Close shelf and reopen its files empty, for the daily reset"""
+    shelf.close()
+    for suffix in DUMB_DBM_SUFFIXES:
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+    return openStore(path, fresh=True)
+
+
+def trendsSnapshotPath() -> Path:
+    return getProjectRoot() / STORES_DIR / TRENDS_SNAPSHOT
+
+
+def trendsSnapshotEnabled() -> bool:
+    """Off with an active cassette: its trends are replayed from the cassette and never published as live ones"""
+    return (CONFIG.get("stores") or {}).get("trends-snapshot", True) and getCassette() is None
+
+
+def readTrendsSnapshot(geo: str) -> list[str]:
+    """Today's trends for geo fetched by any account, empty when there are none"""
+    if not trendsSnapshotEnabled():
+        return []
+    try:
+        snapshot = json.loads(trendsSnapshotPath().read_text())
+    except (OSError, ValueError):
+        return []
+    if snapshot.get("date") != date.today().isoformat():
+        return []
+    return snapshot.get("trends", {}).get(geo, [])
+
+
+def writeTrendsSnapshot(geo: str, trends: list[str]) -> None:
+    """Publish freshly fetched trends for the other accounts, replacing the file atomically"""
+    if not trends or not trendsSnapshotEnabled():
+        return
+    path = trendsSnapshotPath()
+    today = date.today().isoformat()
+    try:
+        snapshot = json.loads(path.read_text())
+    except (OSError, ValueError):
+        snapshot = {}
+    if snapshot.get("date") != today:
+        snapshot = {"date": today, "trends": {}}
+    snapshot["trends"][geo] = trends
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(snapshot, ensure_ascii=False))
+        os.replace(temporary, path)
+    except OSError as e:
+        logging.warning(f"[STORES] Cannot write the trends snapshot: {e}")
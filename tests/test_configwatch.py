@@ -0,0 +1,63 @@
+"""
+ConfigWatcher reloading a config file written to a temporary folder.
+Run from the project root: python -m pytest tests
+"""
+import copy
+
+import pytest
+import yaml
+
+from src import configwatch
+from src.configwatch import ConfigWatcher
+from src.retries import RetryPolicy
+from src.utils import CONFIG
+
+BASE_CONFIG = {
+    "retries": {"backoff-factor": 120, "max": 3, "strategy": "CONSTANT"},
+    "browser": {"visible": True},
+}
+
+
+@pytest.fixture
+def configFile(tmp_path, monkeypatch):
+    saved = copy.deepcopy(dict(CONFIG))
+    CONFIG.update(copy.deepcopy(BASE_CONFIG))
+    # Same reader of the retries section as Searches.reloadSettings
+    monkeypatch.setattr(configwatch, "_appliers", [RetryPolicy.fromConfig])
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(BASE_CONFIG))
+    yield path
+    CONFIG.clear()
+    CONFIG.update(saved)
+
+
+def rewrite(path, change) -> ConfigWatcher:
+    watcher = ConfigWatcher(path, interval=0)
+    config = copy.deepcopy(BASE_CONFIG)
+    change(config)
+    path.write_text(yaml.safe_dump(config))
+    return watcher
+
+
+def test_live_change_is_applied(configFile):
+    watcher = rewrite(configFile, lambda config: config["retries"].update(max=5))
+    assert watcher.reload()
+    assert CONFIG["retries"]["max"] == 5
+
+
+def test_removed_live_key_keeps_its_current_value(configFile):
+    watcher = rewrite(configFile, lambda config: config["retries"].pop("strategy"))
+    assert not watcher.reload()
+    assert CONFIG["retries"]["strategy"] == "CONSTANT"
+    RetryPolicy.fromConfig()
+
+
+def test_failing_applier_rolls_the_change_back(configFile, monkeypatch):
+    def failingApplier():
+        if CONFIG["retries"]["max"] == 5:
+            raise KeyError("max")
+
+    monkeypatch.setattr(configwatch, "_appliers", [failingApplier])
+    watcher = rewrite(configFile, lambda config: config["retries"].update(max=5, strategy="EXPONENTIAL"))
+    assert not watcher.reload()
+    assert CONFIG["retries"] == BASE_CONFIG["retries"]
@@ -0,0 +1,61 @@
+"""
+RewardsCounters against the user info JSON of benchmarks.stubsite, with a fake WebDriver.
+Run from the project root: python -m pytest tests
+"""
+import pytest
+
+from benchmarks.stubsite import StubSite, StubSiteSettings
+from src.counters import RemainingSearches, RewardsCounters
+from src.metrics import RUN_METRICS
+
+AUTH_COOKIE = {"name": "_RwBf", "value": "signed-in", "domain": "127.0.0.1", "path": "/"}
+SEARCH_COOKIE = {"name": "SRCHHPGUSR", "value": "search", "domain": ".bing.com", "path": "/"}
+
+
+class FakeWebDriver:
+    """Sits on bing.com: get_cookies() only returns that domain's cookies, like Selenium does"""
+
+    def __init__(self, cdp: bool = True):
+        self.cdp = cdp
+
+    def get_cookies(self) -> list[dict]:
+        return [SEARCH_COOKIE]
+
+    def execute_cdp_cmd(self, command: str, arguments: dict) -> dict:
+        if not self.cdp:
+            raise AttributeError("execute_cdp_cmd")
+        assert command == "Network.getAllCookies"
+        return {"cookies": [SEARCH_COOKIE, AUTH_COOKIE]}
+
+
+class FakeBrowser:
+    browserType = "desktop"
+    userAgent = "Mozilla/5.0"
+
+    def __init__(self, webdriver: FakeWebDriver):
+        self.webdriver = webdriver
+
+    def getRemainingSearches(self, desktopAndMobile: bool = False) -> RemainingSearches | int:
+        return RemainingSearches(-1, -1) if desktopAndMobile else -1
+
+
+@pytest.fixture
+def site():
+    with StubSite(StubSiteSettings(authCookie=f"{AUTH_COOKIE['name']}={AUTH_COOKIE['value']}")) as site:
+        yield site
+
+
+def test_api_cookies_are_sent_while_the_driver_is_on_another_domain(site):
+    counters = RewardsCounters(FakeBrowser(FakeWebDriver()), ttl=0, url=f"{site.url}api/getuserinfo")
+    fallbacks = RUN_METRICS.counters["counters.fallbacks"]
+
+    assert counters.getRemainingSearches(desktopAndMobile=True) == RemainingSearches(30, 20)
+    assert RUN_METRICS.counters["counters.fallbacks"] == fallbacks
+
+
+def test_current_domain_cookies_alone_fall_back_to_the_dashboard(site):
+    counters = RewardsCounters(FakeBrowser(FakeWebDriver(cdp=False)), ttl=0, url=f"{site.url}api/getuserinfo")
+    fallbacks = RUN_METRICS.counters["counters.fallbacks"]
+
+    assert counters.getRemainingSearches() == -1
+    assert RUN_METRICS.counters["counters.fallbacks"] == fallbacks + 1
@@ -0,0 +1,103 @@
+"""
+NotificationDispatcher against the local webhook of benchmarks.stubsite, sent with apprise's json://.
+Run from the project root: python -m pytest tests
+"""
+import subprocess
+import sys
+from time import monotonic, sleep
+
+import pytest
+
+from benchmarks.stubsite import StubSite, StubSiteSettings
+from src import utils
+from src.metrics import RUN_METRICS
+from src.notifications import NotificationDispatcher, installNotificationDispatcher, sendNotification
+
+
+@pytest.fixture
+def site():
+    with StubSite(StubSiteSettings()) as site:
+        yield site
+
+
+def webhook(site: StubSite) -> str:
+    return site.url.replace("http://", "json://") + "notify"
+
+
+def test_burst_is_coalesced_into_one_message(site):
+    dispatcher = NotificationDispatcher([webhook(site)], coalesceWindow=0.5, minInterval=0, sendTimeout=5)
+    for i in range(3):
+        dispatcher.send(f"title {i}", f"body {i}")
+    dispatcher.close(deadline=5)
+
+    assert len(site.notifications) == 1
+    message = site.notifications[0]
+    assert message["title"] == "3 notifications"
+    assert all(f"title {i}\nbody {i}" in message["message"] for i in range(3))
+
+
+def test_rate_limit_holds_messages_until_the_interval_passed(site):
+    dispatcher = NotificationDispatcher([webhook(site)], coalesceWindow=0, minInterval=1, sendTimeout=5)
+    dispatcher.send("first", "body")
+    sleep(0.3)
+    dispatcher.send("second", "body")
+    sleep(0.3)
+    assert [n["title"] for n in site.notifications] == ["first"]
+    sleep(1)
+    assert [n["title"] for n in site.notifications] == ["first", "second"]
+    dispatcher.close(deadline=5)
+
+
+def test_slow_webhook_send_is_abandoned_after_the_send_timeout(site):
+    site.settings.webhookDelay = 3
+    timeouts = RUN_METRICS.counters["notifications.timeouts"]
+    dispatcher = NotificationDispatcher([webhook(site)], coalesceWindow=0, minInterval=0, sendTimeout=0.5)
+    dispatcher.send("slow", "body")
+    sleep(0.3)  # The worker is now waiting on the webhook
+
+    start = monotonic()
+    dispatcher.close(deadline=5)
+    assert monotonic() - start < 2
+    assert RUN_METRICS.counters["notifications.timeouts"] == timeouts + 1
+    assert not dispatcher.worker.is_alive()
+
+
+def test_close_gives_up_at_its_deadline_even_with_a_full_queue(site):
+    site.settings.webhookDelay = 5
+    dispatcher = NotificationDispatcher(
+        [webhook(site)], coalesceWindow=0, minInterval=0, sendTimeout=10, maxQueued=1
+    )
+    dispatcher.send("blocking", "body")
+    sleep(0.3)  # The worker is now waiting on the webhook
+    dispatcher.send("queued", "body")
+    assert dispatcher.queue.full()
+
+    start = monotonic()
+    dispatcher.close(deadline=0.5)
+    assert monotonic() - start < 1.5
+    assert dispatcher.worker.is_alive()
+
+
+def test_send_after_close_is_dropped_without_blocking(site):
+    dispatcher = NotificationDispatcher([webhook(site)], coalesceWindow=0, minInterval=0)
+    dispatcher.close(deadline=5)
+    dispatcher.send("late", "body")
+    sleep(0.2)
+    assert site.notifications == []
+
+
+def test_utils_send_notification_goes_through_the_installed_dispatcher():
+    installNotificationDispatcher()
+    assert utils.sendNotification is sendNotification
+
+
+def test_message_queued_just_before_exit_is_delivered(site):
+    # The interpreter exits right after the send, the flush runs at its shutdown
+    script = f"""
+from src.utils import CONFIG
+from src.notifications import sendNotification
+CONFIG["apprise"] = {{"enabled": True, "urls": ["{webhook(site)}"], "dispatch": {{"coalesce-window": 0.2}}}}
+sendNotification("last", "body")
+"""
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=30)
+    assert [n["title"] for n in site.notifications] == ["last"]
@@ -0,0 +1,26 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+WARM_UP_LOCK = threading.Lock()  # One warm-up runs at a time
+
+
+def submitWarmUp(function: Callable[..., T], *args) -> Future:
+    """
+    Run function in a daemon thread, one at a time. Unlike an executor worker it is not joined
+    at exit, so a shutdown never waits for an in-flight plan build; cancel() works until it starts.
+    """
+    future: Future = Future()
+
+    def run() -> None:
+        with WARM_UP_LOCK:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(function(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    threading.Thread(target=run, name="warm-up", daemon=True).start()
+    return future
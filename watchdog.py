@@ -0,0 +1,182 @@
+import contextlib
+import logging
+import os
+import signal
+import threading
+from time import monotonic
+from typing import Iterator
+
+import requests
+
+from src.browser import Browser
+from src.metrics import RUN_METRICS
+from src.resources import browserPids, driverPid
+from src.shutdown import pause
+from src.utils import CONFIG, Utils
+
+DEVTOOLS_TIMEOUT = 5  # Seconds, the DevTools HTTP endpoint answers even when chromedriver is wedged
+
+
+def debuggerAddress(browser: Browser) -> str | None:
+    capabilities = browser.webdriver.capabilities
+    for key in ("goog:chromeOptions", "ms:edgeOptions"):
+        address = (capabilities.get(key) or {}).get("debuggerAddress")
+        if address:
+            return address
+    return None
+
+
+class DriverWatchdog(threading.Thread):
+    """
+    Watch the heartbeats of the search thread and recover a wedged WebDriver in place.
+    A step without a heartbeat for stallAfter seconds gets its tab replaced through the DevTools
+    HTTP endpoint, which does not go through chromedriver; restartAfter seconds later the
+    WebDriver and its browser are killed. Either way the blocked call fails in the search thread,
+    which then calls recover() and runs the step again.
+    Cooldowns and retry waits run inside idle() and are never mistaken for a stall.
+    """
+
+    def __init__(self, browser: Browser, stallAfter: float = 120, restartAfter: float = 60, interval: float = 5):
+        super().__init__(name="driver-watchdog", daemon=True)
+        self.browser = browser
+        self.stallAfter = stallAfter
+        self.restartAfter = restartAfter
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.step: str | None = None
+        self.lastBeat = monotonic()
+        self.stalledSince: float | None = None
+        # None, "tab-reset" or "driver-restart": the strongest action taken since the last recover()
+        self.action: str | None = None
+
+    @classmethod
+    def fromConfig(cls, browser: Browser) -> "DriverWatchdog | None":
+        watchdogConfig = CONFIG.get("watchdog") or {}
+        if not watchdogConfig.get("enabled", True):
+            return None
+        return cls(
+            browser,
+            stallAfter=watchdogConfig.get("stall", 120),
+            restartAfter=watchdogConfig.get("restart", 60),
+        )
+
+    @property
+    def tripped(self) -> bool:
+        return self.action is not None
+
+    def beat(self) -> None:
+        self.lastBeat = monotonic()
+
+    @contextlib.contextmanager
+    def watching(self, step: str) -> Iterator[None]:
+        with self.lock:
+            self.step = step
+            self.beat()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.step = None
+
+    @contextlib.contextmanager
+    def idle(self) -> Iterator[None]:
+        with self.lock:
+            step, self.step = self.step, None
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.step = step
+                self.beat()
+
+    def rest(self, seconds: float) -> None:
+        """pause() that is not counted as a stall"""
+        with self.idle():
+            pause(seconds)
+
+    def check(self) -> None:
+        with self.lock:
+            if self.step is None:
+                return
+            stalled = monotonic() - self.lastBeat
+            step = self.step
+        if stalled >= self.stallAfter + self.restartAfter and self.action != "driver-restart":
+            logging.error(f"[WATCHDOG] '{step}' still stalled after {stalled:.0f}s, killing the WebDriver")
+            self.action = "driver-restart"
+            if self.stalledSince is None:
+                self.stalledSince = self.lastBeat
+            self.killDriver()
+        elif stalled >= self.stallAfter and self.action is None:
+            logging.warning(f"[WATCHDOG] '{step}' stalled for {stalled:.0f}s, resetting the tab")
+            self.stalledSince = self.lastBeat
+            self.action = "tab-reset"
+            try:
+                self.resetTab()
+            except Exception as e:
+                logging.warning(f"[WATCHDOG] Tab reset failed: {e}")
+
+    def resetTab(self) -> None:
+        """Open a blank tab and close the others, failing whatever command was pending on them"""
+        address = debuggerAddress(self.browser)
+        if address is None:
+            raise RuntimeError("no DevTools address in the WebDriver capabilities")
+        targets = requests.get(f"http://{address}/json/list", timeout=DEVTOOLS_TIMEOUT).json()
+        requests.put(f"http://{address}/json/new?about:blank", timeout=DEVTOOLS_TIMEOUT).raise_for_status()
+        for target in targets:
+            if target.get("type") == "page":
+                requests.get(f"http://{address}/json/close/{target['id']}", timeout=DEVTOOLS_TIMEOUT)
+
+    def killDriver(self) -> None:
+        root = driverPid(self.browser)
+        pids = browserPids(self.browser) + ([root] if root is not None else [])
+        for pid in pids:
+            with contextlib.suppress(OSError):
+                os.kill(pid, signal.SIGKILL)
+
+    def recover(self) -> None:
+        """
+        Called from the search thread once the stalled call has failed: switch to the fresh tab,
+        or restart the WebDriver if the tab cannot be used
+        """
+        action = self.action
+        if action == "tab-reset":
+            try:
+                webdriver = self.browser.webdriver
+                webdriver.switch_to.window(webdriver.window_handles[-1])
+            except Exception as e:
+                logging.warning(f"[WATCHDOG] Tab reset did not recover the WebDriver: {e}")
+                action = "driver-restart"
+        if action == "driver-restart":
+            restartDriver(self.browser)
+        RUN_METRICS.incr(f"watchdog.{action}s")
+        if self.stalledSince is not None:
+            RUN_METRICS.observe("watchdog.recovery.seconds", monotonic() - self.stalledSince)
+        logging.info(f"[WATCHDOG] Recovered with a {action.replace('-', ' ')}")
+        self.action = None
+        self.stalledSince = None
+        self.beat()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.debug(f"[WATCHDOG] Check failed: {e}")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stopped.set()
+        self.join()
+
+
+def restartDriver(browser: Browser) -> None:
+    """Replace the WebDriver of browser with a new one on the same profile, so the session is kept"""
+    with contextlib.suppress(Exception):
+        browser.webdriver.quit()
+    with RUN_METRICS.timer("browser.launch.seconds"):
+        browser.webdriver = browser.browserSetup()
+    browser.utils = Utils(browser.webdriver)